@@ -1,10 +1,24 @@
-import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objs as go
+import codecs
 import json
-import math
+
+import numpy as np
+import pandas as pd
+from carbon_uncertainty import DEFAULT_ITERATIONS, run_monte_carlo
+from emissions_cube import ALL, CUBE_DIMENSIONS, EmissionsCube
+from carbon_io import COLUMNAR_TYPES, PARQUET_MIME, has_pyarrow, is_columnar, read_table, to_parquet_bytes, totals_frame
+
+# The carbon engine only needs pandas and numpy. Streamlit and plotly are imported by
+# main() when the app runs, so the engine loads in batch jobs and worker processes
+# without any UI framework.
+
+REQUIRED_KEYS = ['material', 'material_type', 'density', 'volume']
+DEFAULT_EMISSION_FACTOR = 0.5  # Default conservative estimate
+
+# Streaming ingestion: records calculated at once, and characters read per file read
+STREAM_CHUNK_SIZE = 50000
+STREAM_BUFFER_SIZE = 1 << 20
+# Uploads up to this size also keep every calculated row for the table and the downloads
+DETAIL_ROWS_MAX_BYTES = 50 * 1024 * 1024
 
 class HyperbuildingCarbonAnalyzer:
     """
@@ -69,6 +83,10 @@ class HyperbuildingCarbonAnalyzer:
             'smart_building_systems'
         ]
 
+        # Aggregated validation of the last calculation and its summary messages
+        self.validation_report = {}
+        self.warnings = []
+
     def generate_sample_hyperbuilding_json(self, complexity='medium'):
         """
         Generate sample hyperbuilding JSON with varied complexity.
@@ -116,6 +134,78 @@ class HyperbuildingCarbonAnalyzer:
         
         return sample_data
 
+    def emission_factor_table(self):
+        """
+        Emission factors as a Series indexed by (material, material_type).
+
+        Returns:
+            Series: Emission factor (kg CO2 per kg) per material and material type.
+        """
+        factors = {
+            (material, material_type): factor
+            for material, types in self.EMISSION_FACTORS.items()
+            for material_type, factor in types.items()
+        }
+        index = pd.MultiIndex.from_tuples(list(factors), names=['material', 'material_type'])
+        return pd.Series(list(factors.values()), index=index, name='emission_factor')
+
+    def calculate_emissions_frame(self, data):
+        """
+        Calculate carbon emissions for hyperbuilding materials, column by column.
+
+        The input is loaded into one DataFrame, emission factors are resolved with an
+        indexed (material, material_type) lookup and mass and emissions are computed as
+        vector operations. Entries are validated as a whole: invalid rows are dropped
+        and summarised in self.validation_report instead of being reported one by one.
+
+        Args:
+            data (list or DataFrame): Material records.
+
+        Returns:
+            DataFrame: Valid records with mass, emission_factor and carbon_emissions columns.
+        """
+        # DataFrame(list) keeps one row per entry, from_records drops empty entries such as {}
+        df = data.copy() if isinstance(data, pd.DataFrame) else pd.DataFrame(list(data))
+        total_rows = len(df)
+
+        # Validate required keys and numeric quantities for all rows at once
+        for key in REQUIRED_KEYS:
+            if key not in df.columns:
+                df[key] = np.nan
+        missing = {key: int(df[key].isna().sum()) for key in REQUIRED_KEYS}
+        present = df[REQUIRED_KEYS].notna().all(axis=1)
+        density = pd.to_numeric(df['density'], errors='coerce')
+        volume = pd.to_numeric(df['volume'], errors='coerce')
+        numeric = density.notna() & volume.notna()
+        non_numeric = int((present & ~numeric).sum())
+        valid = present & numeric
+        df['density'], df['volume'] = density, volume
+        invalid_rows = df.index[~valid]
+        df = df[valid]
+
+        # Indexed join on (material, material_type), unknown pairs fall back to the default
+        keys = pd.MultiIndex.from_arrays([df['material'], df['material_type']])
+        factors = self.emission_factor_table().reindex(keys).to_numpy(dtype=float)
+        unknown = np.isnan(factors)
+        factors = np.where(unknown, DEFAULT_EMISSION_FACTOR, factors)
+
+        mass = df['density'].to_numpy(dtype=float) * df['volume'].to_numpy(dtype=float)
+        df = df.assign(mass=mass, emission_factor=factors, carbon_emissions=mass * factors)
+
+        defaulted = df.loc[unknown, ['material', 'material_type']].value_counts()
+        self.validation_report = {
+            'rows': total_rows,
+            'valid_rows': len(df),
+            'invalid_rows': len(invalid_rows),
+            'missing_values': {key: count for key, count in missing.items() if count},
+            'non_numeric_rows': non_numeric,
+            'invalid_row_examples': [int(i) if isinstance(i, (int, np.integer)) else i for i in invalid_rows[:10]],
+            'default_factor_rows': {f"{material} ({material_type})": int(count)
+                                    for (material, material_type), count in defaulted.items()},
+        }
+        self.warnings = validation_messages(self.validation_report)
+        return df
+
     def calculate_carbon_emissions(self, data):
         """
         Calculate carbon emissions for hyperbuilding materials.
@@ -124,41 +214,274 @@ class HyperbuildingCarbonAnalyzer:
             data (list): List of material dictionaries.
         
         Returns:
-            list: Detailed carbon emissions data.
+            list: Detailed carbon emissions data. A summary of skipped entries and
+                default emission factors is left in self.validation_report and self.warnings.
         """
-        emissions_data = []
-        
-        for item in data:
-            # Validate required keys
-            required_keys = ['material', 'material_type', 'density', 'volume']
-            if not all(key in item for key in required_keys):
-                st.warning(f"Skipping invalid entry: {item}")
-                continue
-            
-            material = item['material']
-            material_type = item.get('material_type', 'standard')
-            
+        if isinstance(data, pd.DataFrame):
+            data = data.to_dict('records')
+        records = list(data)
+        # Only the required keys are calculated with, the others are copied from the entries
+        df = self.calculate_emissions_frame(
+            pd.DataFrame({key: [item.get(key) for item in records] for key in REQUIRED_KEYS}))
+        # The frame is indexed by input position, so valid entries are kept as given
+        # and only the calculated values are added to them
+        return [dict(records[i], mass=mass, emission_factor=factor, carbon_emissions=emissions)
+                for i, mass, factor, emissions in zip(df.index.tolist(), df['mass'].tolist(),
+                                                      df['emission_factor'].tolist(),
+                                                      df['carbon_emissions'].tolist())]
+
+    def analyze_stream(self, source, chunk_size=STREAM_CHUNK_SIZE, group_by=('component', 'material'),
+                       keep_rows=False, preview_rows=1000):
+        """
+        Calculate carbon emissions of a JSON array of material records, chunk by chunk.
+
+        The array is parsed incrementally and at most chunk_size records are held in
+        memory at once, so peak memory does not grow with the size of the takeoff.
+
+        Args:
+            source: Binary or text file object containing a JSON array of records.
+            chunk_size (int): Number of records calculated at once.
+            group_by (tuple): Columns to total mass and emissions by.
+            keep_rows (bool): Return every calculated row (memory then grows with the input).
+            preview_rows (int): Number of rows returned when keep_rows is off.
+
+        Returns:
+            dict: total_emissions, total_mass, totals (a DataFrame of mass and
+                carbon_emissions per group_by column), cube (an EmissionsCube of the
+                whole input) and rows (every row or a preview). The merged validation
+                is left in self.validation_report and self.warnings.
+        """
+        totals = dict.fromkeys(group_by)
+        cube = EmissionsCube()
+        rows, kept = [], 0
+        total_emissions = total_mass = 0.0
+        report = None
+
+        for start, records in iter_record_chunks(source, chunk_size):
+            chunk = pd.DataFrame(records)
+            chunk.index += start  # Row numbers of the whole file in the validation report
+            df = self.calculate_emissions_frame(chunk)
+            report = merge_validation_reports(report, self.validation_report)
+
+            total_emissions += float(df['carbon_emissions'].sum())
+            total_mass += float(df['mass'].sum())
+            for column, grouped in group_totals(df, group_by).items():
+                totals[column] = grouped if totals[column] is None else totals[column].add(grouped, fill_value=0)
+            cube.add_frame(df)
+            if keep_rows:
+                rows.append(df)
+            elif kept < preview_rows:
+                rows.append(df.head(preview_rows - kept))
+                kept += len(rows[-1])
+
+        self.validation_report = report or merge_validation_reports(None, {})
+        self.warnings = validation_messages(self.validation_report)
+        empty = pd.DataFrame(columns=['mass', 'carbon_emissions'])
+        return {
+            'total_emissions': total_emissions,
+            'total_mass': total_mass,
+            'totals': {column: empty if grouped is None else grouped for column, grouped in totals.items()},
+            'cube': cube,
+            'rows': pd.concat(rows) if rows else pd.DataFrame(),
+        }
+
+    def analyze_table(self, source, group_by=('component', 'material'), columns=None):
+        """
+        Calculate carbon emissions of a Parquet or Arrow takeoff.
+
+        Only the columns the calculation, the grouping and the cube need are read from
+        the file (plus any extra columns asked for), so descriptive text columns of large
+        takeoffs are never decoded.
+
+        Args:
+            source: Path or binary file object of a .parquet, .arrow or .feather file.
+            group_by (tuple): Columns to total mass and emissions by.
+            columns (list): Extra columns to keep in the returned rows.
+
+        Returns:
+            dict: Same keys as analyze_stream, with every row in rows.
+        """
+        projection = REQUIRED_KEYS + list(group_by) + list(CUBE_DIMENSIONS) + list(columns or [])
+        df = self.calculate_emissions_frame(read_table(source, projection))
+        empty = pd.DataFrame(columns=['mass', 'carbon_emissions'])
+        totals = group_totals(df, group_by)
+        return {
+            'total_emissions': float(df['carbon_emissions'].sum()),
+            'total_mass': float(df['mass'].sum()),
+            'totals': {column: totals.get(column, empty) for column in group_by},
+            'cube': EmissionsCube.from_frame(df),
+            'rows': df,
+        }
+
+
+    def simulate_uncertainty(self, df, iterations=DEFAULT_ITERATIONS, **options):
+        """
+        Monte Carlo confidence intervals of calculated emissions.
+
+        Emission factors and densities are sampled around the point estimates used by
+        calculate_emissions_frame, see carbon_uncertainty.run_monte_carlo for the options.
+
+        Args:
+            df (DataFrame): Rows from calculate_emissions_frame.
+            iterations (int): Number of simulated iterations.
+
+        Returns:
+            dict: Summary per component, material and building, plus the total.
+        """
+        return run_monte_carlo(df, self.emission_factor_table(), iterations, **options)
+
+
+def group_totals(df, group_by):
+    """Total mass and carbon emissions per value of each group_by column present in df."""
+    return {column: df.groupby(column)[['mass', 'carbon_emissions']].sum()
+            for column in group_by if column in df.columns}
+
+
+def validation_messages(report):
+    """
+    Summarise a validation report as a few human-readable messages.
+
+    Args:
+        report (dict): Report from HyperbuildingCarbonAnalyzer.calculate_emissions_frame.
+
+    Returns:
+        list: One message per kind of problem.
+    """
+    messages = []
+    if report['invalid_rows']:
+        details = ', '.join(f"{count} missing {key}" for key, count in report['missing_values'].items())
+        if report['non_numeric_rows']:
+            details = ', '.join(filter(None, [details, f"{report['non_numeric_rows']} with non-numeric density or volume"]))
+        messages.append(f"Skipped {report['invalid_rows']} of {report['rows']} entries ({details}). "
+                        f"First skipped rows: {report['invalid_row_examples']}")
+    if report['default_factor_rows']:
+        pairs = ', '.join(f"{pair}: {count}" for pair, count in report['default_factor_rows'].items())
+        messages.append(f"No emission factor for {sum(report['default_factor_rows'].values())} entries, "
+                        f"used the default {DEFAULT_EMISSION_FACTOR} ({pairs})")
+    return messages
+
+def merge_validation_reports(report, other):
+    """
+    Combine the validation reports of two chunks of the same input.
+
+    Args:
+        report (dict): Report so far, None for the first chunk.
+        other (dict): Report of the next chunk.
+
+    Returns:
+        dict: Report covering both chunks.
+    """
+    merged = {
+        'rows': 0, 'valid_rows': 0, 'invalid_rows': 0, 'missing_values': {},
+        'non_numeric_rows': 0, 'invalid_row_examples': [], 'default_factor_rows': {},
+    }
+    for part in (report or {}, other):
+        for key in ('rows', 'valid_rows', 'invalid_rows', 'non_numeric_rows'):
+            merged[key] += part.get(key, 0)
+        for key in ('missing_values', 'default_factor_rows'):
+            for name, count in part.get(key, {}).items():
+                merged[key][name] = merged[key].get(name, 0) + count
+        merged['invalid_row_examples'] = (merged['invalid_row_examples'] + part.get('invalid_row_examples', []))[:10]
+    return merged
+
+
+def iter_json_array(source, buffer_size=STREAM_BUFFER_SIZE):
+    """
+    Yield the items of a top-level JSON array one at a time.
+
+    Only one buffer of text and the item being decoded are held in memory, so
+    takeoffs far larger than the available memory can be read.
+
+    Args:
+        source: Binary (UTF-8) or text file object.
+        buffer_size (int): Number of bytes or characters read at a time.
+
+    Yields:
+        object: Each item of the array, decoded.
+
+    Raises:
+        json.JSONDecodeError: If the input is not a single JSON array (a ValueError).
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8-sig')()
+    buffer, position, eof = '', 0, False
+
+    def fill():
+        nonlocal buffer, position, eof
+        chunk = source.read(buffer_size)
+        eof = not chunk
+        if isinstance(chunk, bytes):
+            chunk = utf8.decode(chunk, final=eof)
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    def next_char():
+        # Skip whitespace, reading more input as needed. Empty string at the end of input.
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n':
+                position += 1
+            if position < len(buffer) or eof:
+                return buffer[position:position + 1]
+            fill()
+
+    if next_char() != '[':
+        raise json.JSONDecodeError("Expected a JSON array", buffer, position)
+    position += 1
+    first = True
+    while True:
+        char = next_char()
+        if char == ']':
+            position += 1
+            # Like json.load, only whitespace may follow the array
+            if next_char():
+                raise json.JSONDecodeError("Extra data", buffer, position)
+            return
+        if not first:
+            if char != ',':
+                raise json.JSONDecodeError("Expected ',' or ']'", buffer, position)
+            position += 1
+            next_char()
+        first = False
+        while True:
             try:
-                emission_factor = self.EMISSION_FACTORS[material][material_type]
-            except KeyError:
-                st.warning(f"No emission factor for {material} ({material_type}). Using default.")
-                emission_factor = 0.5  # Default conservative estimate
-            
-            # Calculate mass and carbon emissions
-            mass = item['density'] * item['volume']
-            carbon_emissions = mass * emission_factor
-            
-            emissions_data.append({
-                **item,
-                'mass': mass,
-                'emission_factor': emission_factor,
-                'carbon_emissions': carbon_emissions
-            })
-        
-        return emissions_data
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()  # The item continues in the next part of the input
+                continue
+            if not eof and (end == len(buffer) or buffer[end] not in ' \t\r\n,]'):
+                fill()  # A number cut by the end of the buffer may continue in the next part
+                continue
+            break
+        position = end
+        yield item
+
+
+def iter_record_chunks(source, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Group the records of a JSON array into lists of at most chunk_size records.
+
+    Yields:
+        tuple: (index of the first record in the array, list of records).
+    """
+    chunk, start = [], 0
+    for record in iter_json_array(source):
+        chunk.append(record)
+        if len(chunk) == chunk_size:
+            yield start, chunk
+            start += len(chunk)
+            chunk = []
+    if chunk:
+        yield start, chunk
+
 
 def main():
     """Main Streamlit application entry point."""
+    import streamlit as st
+    import plotly.express as px
+
     st.set_page_config(
         page_title="Hyperbuilding Carbon Emissions Analyzer", 
         page_icon="🏙️", 
@@ -192,28 +515,43 @@ def main():
         st.subheader("Data Upload")
         uploaded_file = st.file_uploader(
             "Upload Materials JSON", 
-            type=['json'],
-            help="Upload a JSON file containing building material details"
+            type=['json'] + (COLUMNAR_TYPES if has_pyarrow() else []),
+            help="Upload a JSON, Parquet or Arrow file containing building material details"
         )
     
     # Main Analysis Section
     if uploaded_file is not None:
         try:
-            data = json.load(uploaded_file)
-            emissions_data = analyzer.calculate_carbon_emissions(data)
-            
-            df = pd.DataFrame(emissions_data)
+            # Streamlit reruns the script on every interaction, the analysis and its cube
+            # are computed once per uploaded file and kept in the session
+            upload_id = getattr(uploaded_file, 'file_id', None) or (uploaded_file.name, uploaded_file.size)
+            cached = st.session_state.get('carbon_analysis')
+            if cached is None or cached[0] != upload_id:
+                if is_columnar(uploaded_file):
+                    # Columnar takeoffs are read with only the columns the analysis needs
+                    keep_rows = True
+                    result = analyzer.analyze_table(uploaded_file)
+                else:
+                    # Parsed and calculated in chunks, large takeoffs keep only a preview of the rows
+                    keep_rows = uploaded_file.size <= DETAIL_ROWS_MAX_BYTES
+                    result = analyzer.analyze_stream(uploaded_file, keep_rows=keep_rows)
+                cached = (upload_id, result, keep_rows, analyzer.validation_report, analyzer.warnings)
+                st.session_state['carbon_analysis'] = cached
+            _, result, keep_rows, analyzer.validation_report, analyzer.warnings = cached
+            df = result['rows']
+            for message in analyzer.warnings:
+                st.warning(message)
             
             # Overview Metrics
             st.header("Carbon Emissions Overview")
             col1, col2 = st.columns(2, border=True)
             
             with col1:
-                total_emissions = df['carbon_emissions'].sum()
+                total_emissions = result['total_emissions']
                 st.metric("Total Carbon Emissions", f"{total_emissions:,.2f} kg CO2")
             
             with col2:
-                total_mass = df['mass'].sum()
+                total_mass = result['total_mass']
                 st.metric("Total Material Mass", f"{total_mass:,.2f} kg")
             
             # Visualizations
@@ -223,7 +561,7 @@ def main():
             
             with col1:
                 # Emissions by Component Pie Chart
-                component_emissions = df.groupby('component')['carbon_emissions'].sum()
+                component_emissions = result['totals']['component']['carbon_emissions']
                 fig_pie = px.pie(
                     height=600,
                     color_discrete_sequence=px.colors.sequential.Sunsetdark,
@@ -236,7 +574,7 @@ def main():
             
             with col2:
                 # Emissions by Material Bar Chart
-                material_emissions = df.groupby('material')['carbon_emissions'].sum()
+                material_emissions = result['totals']['material']['carbon_emissions']
                 fig_bar = px.bar(
                     height=600,
                     color_discrete_sequence=px.colors.sequential.Emrld_r,
@@ -248,13 +586,92 @@ def main():
                 )
                 st.plotly_chart(fig_bar, use_container_width=True)
             
+            # Drill-down, every slice is read from the precomputed cube
+            st.header("Emissions Drill-down")
+            cube = result['cube']
+            filters = {}
+            for column, dimension in zip(st.columns(len(cube.dimensions)), cube.dimensions):
+                choice = column.selectbox(
+                    dimension.replace('_', ' ').capitalize(),
+                    [ALL] + cube.values(dimension, **filters),
+                    format_func=lambda value: 'All' if value is ALL else value,
+                    key=f"drill_{dimension}"
+                )
+                if choice is not ALL:
+                    filters[dimension] = choice
+            
+            selection = cube.total(**filters)
+            col1, col2, col3 = st.columns(3, border=True)
+            col1.metric("Selection Carbon Emissions", f"{selection['carbon_emissions']:,.2f} kg CO2")
+            col2.metric("Selection Material Mass", f"{selection['mass']:,.2f} kg")
+            col3.metric("Selection Entries", f"{selection['rows']:,}")
+            
+            next_dimension = next((d for d in cube.dimensions if d not in filters), None)
+            if next_dimension is not None:
+                breakdown = cube.children(next_dimension, **filters)
+                fig_drill = px.bar(
+                    height=500,
+                    color_discrete_sequence=px.colors.sequential.Sunsetdark,
+                    x=breakdown.index,
+                    y=breakdown['carbon_emissions'],
+                    title=f"Carbon Emissions by {next_dimension.replace('_', ' ').capitalize()}",
+                    labels={'x': next_dimension, 'y': 'Carbon Emissions (kg CO2)'}
+                )
+                st.plotly_chart(fig_drill, use_container_width=True)
+            
+            # Monte Carlo uncertainty of the emission factors and densities
+            st.header("Uncertainty Analysis")
+            if keep_rows:
+                iterations = st.number_input("Monte Carlo iterations", min_value=1000, max_value=200000,
+                                             value=DEFAULT_ITERATIONS, step=1000)
+                if st.button("Run Uncertainty Analysis", disabled=df.empty,
+                             help="Needs at least one valid entry" if df.empty else None):
+                    with st.spinner("Sampling emission factors and densities..."):
+                        st.session_state['carbon_uncertainty'] = (upload_id, iterations,
+                                                                  analyzer.simulate_uncertainty(df, iterations))
+                uncertainty = st.session_state.get('carbon_uncertainty')
+                if uncertainty is not None and uncertainty[:2] == (upload_id, iterations):
+                    uncertainty = uncertainty[2]
+                    total = uncertainty['summaries']['total'].iloc[0]
+                    confidence = f"{uncertainty['confidence']:.0%}"
+                    st.metric(f"Total Carbon Emissions ({confidence} interval)",
+                              f"{total['ci_low']:,.0f} – {total['ci_high']:,.0f} kg CO2")
+                    st.caption(f"{uncertainty['iterations']:,} iterations on {uncertainty['workers']} processes "
+                               f"in {uncertainty['seconds']:.2f}s")
+                    for tab, column in zip(st.tabs(["Component", "Material", "Building"]),
+                                           ['component', 'material', 'building_name']):
+                        summary = uncertainty['summaries'].get(column)
+                        if summary is None:
+                            tab.info(f"The data has no {column} column")
+                            continue
+                        fig_ci = px.bar(
+                            height=500,
+                            color_discrete_sequence=px.colors.sequential.Emrld_r,
+                            x=summary.index,
+                            y=summary['median'],
+                            error_y=summary['ci_high'] - summary['median'],
+                            error_y_minus=summary['median'] - summary['ci_low'],
+                            title=f"Carbon Emissions by {column.replace('_', ' ').capitalize()} ({confidence} interval)",
+                            labels={'x': column, 'y': 'Carbon Emissions (kg CO2)'}
+                        )
+                        tab.plotly_chart(fig_ci, use_container_width=True)
+                        tab.dataframe(summary, use_container_width=True)
+            else:
+                st.info("Uncertainty analysis needs every row, upload files up to "
+                        f"{DETAIL_ROWS_MAX_BYTES // (1024 * 1024)} MB or a Parquet file.")
+            
             # Detailed Data Table
             st.header("Comprehensive Emissions Data")
             st.dataframe(df, use_container_width=True, height=1000)
+            if not keep_rows:
+                st.caption(f"Large upload: showing the first {len(df):,} of {analyzer.validation_report['valid_rows']:,} rows, "
+                           "the reports below contain the totals")
+                # Totals per component and material replace the row-level reports
+                df = totals_frame(result['totals'])
             
             # Download Options
             st.header("Export Analysis")
-            col1, col2 = st.columns(2)
+            col1, col2, col3 = st.columns(3)
             
             with col1:
                 st.download_button(
@@ -267,10 +684,19 @@ def main():
             with col2:
                 st.download_button(
                     label="Download JSON Report",
-                    data=json.dumps(emissions_data, indent=2),
+                    data=df.to_json(orient='records', indent=2),
                     file_name="hyperbuilding_carbon_emissions.json",
                     mime="application/json"
                 )
+            
+            if has_pyarrow():
+                with col3:
+                    st.download_button(
+                        label="Download Parquet Report",
+                        data=to_parquet_bytes(df),
+                        file_name="hyperbuilding_carbon_emissions.parquet",
+                        mime=PARQUET_MIME
+                    )
         
         except json.JSONDecodeError:
             st.error("Invalid JSON file. Please check your file format.")
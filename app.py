@@ -1,15 +1,39 @@
-import gradio as gr
-from specklepy.api.client import SpeckleClient
-from specklepy.api.credentials import get_account_from_token
-import pandas as pd
-from config import speckle_token
+import startup_profile  # first, so HYPERB_PROFILE=1 times every import below
+import os
+import threading
+import time
 
-from program import p_demo
+import gradio as gr
+from speckle_session import project_id
+from project_snapshot import find_model, latest_version, models_for_team, models_with_prefix, start_refresher
+from sheets import read_sheet, prefetch_sheets
+from sheet_registry import REQUIREMENTS
+from kpis import BUILDING_METRICS
+
+# Download every registered sheet concurrently in the background, so they are usually
+# cached by the time a team tab is first selected
+threading.Thread(target=prefetch_sheets, name="sheet-prefetch", daemon=True).start()
+
+# Page modules only build their layout here, their data loads when their tab is first selected
+import program, residential_page, service_page, industrial_page, facade_page, structural_page
+p_demo = program.build_demo()
 from residential_page import r_demo
 from service_page import s_demo
 from industrial_page import i_demo
 from facade_page import f_demo
 from structural_page import st_demo
+from lazy_page import load_pages
+
+pages = [program.page, residential_page.page, service_page.page, industrial_page.page, facade_page.page, structural_page.page]
+
+# With HYPERB_EAGER_PAGES=1 every page loads its data up front, all pages concurrently
+eager_pages = os.environ.get("HYPERB_EAGER_PAGES", "") not in ("", "0")
+if eager_pages:
+    started = time.perf_counter()
+    page_timings = load_pages(pages)
+    print(f"Loaded {len(pages)} pages in {time.perf_counter() - started:.2f}s")
+    for name, seconds in sorted(page_timings.items(), key=lambda item: -(item[1] or 0)):
+        print(f"  {name:<12} " + ("failed" if seconds is None else f"{seconds:.2f}s"))
 
 js_func = """
 function refresh() {
@@ -43,7 +67,7 @@ dashboard_description = """
 
 
 # Metrics cards in a row with matching style to your dashboard
-metrics_html = """
+metrics_html = f"""
 <div style="padding: 20px; font-family: 'Roboto Mono', monospace;">
     <!-- Import Roboto Mono font -->
     <link href="https://fonts.googleapis.com/css2?family=Roboto+Mono:wght@400;500;700&display=swap" rel="stylesheet">
@@ -58,7 +82,7 @@ metrics_html = """
                 TOWER GFA
             </div>
             <div style="color: #ffffff; font-size: 28px; font-weight: 700; letter-spacing: 0.5px; font-family: 'Roboto Mono', monospace;">
-                450k m²
+                {BUILDING_METRICS['tower_gfa_m2'] // 1000}k m²
             </div>
         </div>
         
@@ -69,7 +93,7 @@ metrics_html = """
                 TALLEST TOWER
             </div>
             <div style="color: #ffffff; font-size: 28px; font-weight: 700; letter-spacing: 0.5px; font-family: 'Roboto Mono', monospace;">
-                280 m
+                {BUILDING_METRICS['tallest_tower_height_m']} m
             </div>
         </div>
         
@@ -80,7 +104,7 @@ metrics_html = """
                 TALLEST TOWER
             </div>
             <div style="color: #ffffff; font-size: 28px; font-weight: 700; letter-spacing: 0.5px; font-family: 'Roboto Mono', monospace;">
-                60 FLOORS
+                {BUILDING_METRICS['tallest_tower_floors']} FLOORS
             </div>
         </div>
         
@@ -91,7 +115,7 @@ metrics_html = """
                 NUMBER OF INHABITANTS
             </div>
             <div style="color: #ffffff; font-size: 28px; font-weight: 700; letter-spacing: 0.5px; font-family: 'Roboto Mono', monospace;">
-                6208
+                {BUILDING_METRICS['inhabitants']}
             </div>
         </div>
 
@@ -102,7 +126,7 @@ metrics_html = """
                 LOWEST TOWER
             </div>
             <div style="color: #ffffff; font-size: 28px; font-weight: 700; letter-spacing: 0.5px; font-family: 'Roboto Mono', monospace;">
-                200 m
+                {BUILDING_METRICS['lowest_tower_height_m']} m
             </div>
         </div>
 
@@ -113,7 +137,7 @@ metrics_html = """
                 LOWEST TOWER
             </div>
             <div style="color: #ffffff; font-size: 28px; font-weight: 700; letter-spacing: 0.5px; font-family: 'Roboto Mono', monospace;">
-                48 FLOORS
+                {BUILDING_METRICS['lowest_tower_floors']} FLOORS
             </div>
         </div>
     </div>
@@ -163,23 +187,17 @@ body, h1, h2, h3, p, div, span, button, input, select, textarea {
 """
 
 
-# Initialize Speckle client and credentials
-speckle_server = "macad.speckle.xyz"
-client = SpeckleClient(host=speckle_server)
-account = get_account_from_token(speckle_token, speckle_server)
-client.authenticate_with_account(account)
-project_id = "28a211b286"
-project = client.project.get_with_models(project_id=project_id, models_limit=100)
+# Shared Speckle project snapshot, refreshed in the background
+start_refresher()
 
 # Function to update viewer and stats
 def create_viewer_url(model_name):
     # Find the model in the project
-    model = next((m for m in project.models.items if m.name == model_name), None)
+    model = find_model(model_name)
     if model:
-        versions = client.version.get_versions(model_id=model.id, project_id=project_id, limit=1).items
-        if versions:
-            version = versions[0]
-            embed_src = f"https://macad.speckle.xyz/projects/{project_id}/models/{model.id}@{version.id}#embed=%7B%22isEnabled%22%3Atrue%2C%7D"
+        version = latest_version(model.id)
+        if version is not None:
+            embed_src = f"https://macad.speckle.xyz/projects/{project_id}/models/{model.id}@{version['id']}#embed=%7B%22isEnabled%22%3Atrue%2C%7D"
             return f'<iframe src="{embed_src}" style="width:100%; height:750px; border:none;"></iframe>'
         else:
             return "No versions found for this model."
@@ -188,21 +206,7 @@ def create_viewer_url(model_name):
 
 # Add this function to filter models by team selection
 def update_model_selection_by_team(team_selection):
-    models = project.models.items
-
-    if team_selection == "Residential":
-        filtered_models = [m.name for m in models if m.name.startswith('residential/share')]
-    elif team_selection == "Structure":
-        filtered_models = [m.name for m in models if m.name.startswith('structure/share')]
-    elif team_selection == "Service":
-        filtered_models = [m.name for m in models if m.name.startswith('service')]
-    elif team_selection == "Facade":
-        filtered_models = [m.name for m in models if m.name.startswith('facade')]
-    elif team_selection == "Industrial":
-        filtered_models = [m.name for m in models if m.name.startswith('industrial')]
-    elif team_selection == "Data":
-        filtered_models = [m.name for m in models if m.name.startswith('data')]
-
+    filtered_models = [m.name for m in models_for_team(team_selection)]
     return gr.Dropdown(choices=filtered_models, label="Select Model", container=False)
 
 iframe_html = '''
@@ -213,17 +217,12 @@ iframe_html = '''
 '''
 
 # Requirements sheet
-sheet_csv_urls = {
-    "Residential": "https://docs.google.com/spreadsheets/d/1yZRMx0Reso1ye_OGvZoSC9BE_jwYAZAtmm9w8U0fqUs/export?format=csv",
-    "Service": "https://docs.google.com/spreadsheets/d/1u6Sm7_eCTxN5gY4GMqggZG4zdgEhLy67BjkcpkVXg3A/export?format=csv",
-    "Facade": "https://docs.google.com/spreadsheets/d/1TbWJKI39oWrXVW4r8LoieRx9nuRdEQvuUVe-rXqotrc/export?format=csv",
-    "Structure": "https://docs.google.com/spreadsheets/d/1uIBeQa6y3gfS6D8nsHesmj9GVSo7UBWNGTdi6NM4oak/export?format=csv",
-    "Industrial": "https://docs.google.com/spreadsheets/d/1dxIEr_TIosqf5fb8_GNUxXZuG6WDWhnEfhcFtiDnY_I/export?format=csv",
-}
+sheet_csv_urls = REQUIREMENTS
 
 def load_sheet(team):
     if team in sheet_csv_urls:
-        df = pd.read_csv(sheet_csv_urls[team])
+        # Served from the shared cache, expired sheets are refreshed in the background
+        df = read_sheet(sheet_csv_urls[team], background_refresh=True)
         return df
 
 
@@ -248,7 +247,7 @@ with gr.Blocks(css=custom_css, js=js_func, theme=gr.themes.Default(primary_hue="
                 viewer_iframe = gr.HTML()
 
             with gr.Column():
-                models_res = [item for item in project.models.items if item.name.startswith('residential/')]
+                models_res = models_with_prefix('residential/')
                 models_name_res = [m.name for m in models_res]
                 models_name_res = [name.split('/', 1)[1] if '/' in name else name for name in models_name_res]
                 gr.Markdown(":Select a team to view", rtl = True)
@@ -262,19 +261,25 @@ with gr.Blocks(css=custom_css, js=js_func, theme=gr.themes.Default(primary_hue="
                 sheet_display = gr.DataFrame(show_row_numbers=True, column_widths=["50%","50%"])
                 team_dropdown.change(fn=load_sheet, inputs=team_dropdown, outputs=sheet_display)
 
-    with gr.Tab("Program Overview"):
+    with gr.Tab("Program Overview") as program_tab:
         p_demo.render()
-    with gr.Tab("Residential Team"):
+    with gr.Tab("Residential Team") as residential_tab:
         r_demo.render()
-    with gr.Tab("Service Team"):
+    with gr.Tab("Service Team") as service_tab:
         s_demo.render()
-    with gr.Tab("Industrial Team"):
+    with gr.Tab("Industrial Team") as industrial_tab:
         i_demo.render()
-    with gr.Tab("Structural Team"):
+    with gr.Tab("Structural Team") as structural_tab:
         st_demo.render()
-    with gr.Tab("Facade Team"):
+    with gr.Tab("Facade Team") as facade_tab:
         f_demo.render()
 
+    # Load each team's data the first time its tab is selected, pages loaded up front are
+    # filled as soon as the dashboard opens
+    tabs = [program_tab, residential_tab, service_tab, industrial_tab, facade_tab, structural_tab]
+    for page, tab in zip(pages, tabs):
+        page.attach(tab, load_with=demo if eager_pages and page.loaded else None)
+
     # Load spekcle viewer
     def initialize_app():
         viewer_url = create_viewer_url('residential/shared/unit_exterior_walls')
@@ -300,6 +305,9 @@ with gr.Blocks(css=custom_css, js=js_func, theme=gr.themes.Default(primary_hue="
 
     # Rest of your dashboard...
 
+# Waterfall of the startup phases when HYPERB_PROFILE=1
+startup_profile.report()
+
 demo.launch()
 
 # gradio app.py
\ No newline at end of file
@@ -3,7 +3,6 @@ import pandas as pd
 import plotly.express as px
 from specklepy.api.client import SpeckleClient
 from specklepy.api.credentials import get_account_from_token
-import matplotlib.pyplot as plt
 
 # def create_dashboard():
 # Initialize Speckle client and credentials
@@ -176,6 +175,7 @@ df_all = pd.DataFrame({
 
 # Create pie charts for program calculator
 def create_program_charts():
+    import matplotlib.pyplot as plt  # only the program calculator needs matplotlib
     # Data for the first pie chart
     fig1, ax1 = plt.subplots(figsize=(8, 8))
     wedges1, _, _ = ax1.pie(data_podium["Values"], autopct='%1.1f%%', 
@@ -0,0 +1,103 @@
+import importlib.util
+import io
+
+import pandas as pd
+
+# Columnar input and output for the carbon analyzers.
+# Takeoffs can be read from Parquet or Arrow IPC (Feather) files as well as JSON. Reads
+# are projected, so only the columns an analysis needs are decoded, and reports are
+# written as compressed Parquet. pyarrow is imported on first use, the JSON paths work
+# without it.
+
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+ARROW_SUFFIXES = ('.arrow', '.feather')
+COLUMNAR_TYPES = ['parquet', 'pq', 'arrow', 'feather']
+PARQUET_MIME = 'application/vnd.apache.parquet'
+DEFAULT_COMPRESSION = 'zstd'
+
+
+def has_pyarrow():
+    """Whether pyarrow is installed, without importing it."""
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def _name(source):
+    return str(getattr(source, 'name', source)).lower()
+
+
+def is_columnar(source):
+    """Whether a path or uploaded file is a Parquet or Arrow file, judging by its name."""
+    return _name(source).endswith(PARQUET_SUFFIXES + ARROW_SUFFIXES)
+
+
+def _rewind(source):
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+
+def columns_of(source):
+    """
+    Column names of a Parquet or Arrow file, read from its schema only.
+
+    Args:
+        source: Path or binary file object.
+
+    Returns:
+        list: Column names in file order.
+    """
+    if _name(source).endswith(ARROW_SUFFIXES):
+        import pyarrow as pa
+        names = pa.ipc.open_file(source).schema.names
+    else:
+        import pyarrow.parquet as pq
+        names = pq.read_schema(source).names
+    _rewind(source)
+    return list(names)
+
+
+def read_table(source, columns=None):
+    """
+    Read a Parquet or Arrow file into a DataFrame, decoding only the given columns.
+
+    Args:
+        source: Path or binary file object.
+        columns (list): Columns to read, those the file does not have are skipped.
+            None reads every column.
+
+    Returns:
+        DataFrame: The projected table.
+    """
+    if columns is not None:
+        available = set(columns_of(source))
+        columns = [column for column in dict.fromkeys(columns) if column in available]
+    if _name(source).endswith(ARROW_SUFFIXES):
+        from pyarrow import feather
+        table = feather.read_table(source, columns=columns)
+    else:
+        import pyarrow.parquet as pq
+        table = pq.read_table(source, columns=columns)
+    _rewind(source)
+    return table.to_pandas()
+
+
+def write_table(df, path, compression=DEFAULT_COMPRESSION):
+    """Write a DataFrame as Parquet, or as an Arrow (Feather) file when path ends with .arrow or .feather."""
+    if str(path).lower().endswith(ARROW_SUFFIXES):
+        df.reset_index(drop=True).to_feather(path, compression=compression)
+    else:
+        df.to_parquet(path, engine='pyarrow', compression=compression, index=False)
+    return path
+
+
+def to_parquet_bytes(df, compression=DEFAULT_COMPRESSION):
+    """Serialise a DataFrame as compressed Parquet, for downloads."""
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, engine='pyarrow', compression=compression, index=False)
+    return buffer.getvalue()
+
+
+def totals_frame(totals):
+    """Stack per-column totals ({column: DataFrame}) into one table with dimension and value columns."""
+    if not totals:
+        return pd.DataFrame(columns=['dimension', 'value', 'mass', 'carbon_emissions'])
+    return pd.concat(totals, names=['dimension', 'value']).reset_index()
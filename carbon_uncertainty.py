@@ -0,0 +1,201 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Monte Carlo uncertainty of embodied carbon.
+# Emission factors and densities are sampled from lognormal distributions centred on
+# their point estimates. A factor is drawn once per (material, material_type) and
+# iteration, so every row using it moves together, while densities are drawn per row.
+# Rows are sorted into cells sharing a factor and all grouped values. Each batch of
+# iterations samples an (iterations x rows) mass matrix, sums it per cell, applies the
+# factors and totals the cells per group with a matrix product against a cell-to-group
+# indicator matrix. The batches are spread over a process pool.
+
+# Coefficient of variation of the emission factors per material
+FACTOR_CV = {
+    'concrete': 0.15,
+    'steel': 0.2,
+    'aluminum': 0.3,
+    'glass': 0.2,
+    'insulation': 0.3,
+    'carbon_fiber': 0.35,
+    'advanced_composites': 0.35,
+}
+DEFAULT_FACTOR_CV = 0.25  # Listed material without its own estimate
+UNKNOWN_FACTOR_CV = 1.0  # Rows that fell back to the default emission factor
+DENSITY_CV = 0.05
+
+DEFAULT_ITERATIONS = 10000
+CONFIDENCE = 0.95
+UNCERTAINTY_GROUPS = ('component', 'material', 'building_name')
+MISSING = '(none)'
+# Largest (iterations x rows) matrix a worker simulates at once
+BATCH_ELEMENTS = 2_000_000
+
+_worker_model = None
+
+
+def lognormal_params(mean, cv):
+    """Log-space mean and sigma of a lognormal with the given mean and coefficient of variation."""
+    sigma = np.sqrt(np.log1p(np.square(cv)))
+    with np.errstate(divide='ignore'):
+        return np.log(mean) - sigma ** 2 / 2, sigma
+
+
+def build_model(df, factor_table, group_by=UNCERTAINTY_GROUPS, density_cv=DENSITY_CV):
+    """
+    Distribution parameters and group indicators of calculated rows.
+
+    Args:
+        df (DataFrame): Rows from HyperbuildingCarbonAnalyzer.calculate_emissions_frame.
+        factor_table (Series): Emission factors indexed by (material, material_type).
+        group_by (tuple): Columns to report confidence intervals for.
+        density_cv (float): Coefficient of variation of every density.
+
+    Returns:
+        dict: Arrays shared by every worker.
+
+    Raises:
+        ValueError: If df has no rows.
+    """
+    if df.empty:
+        raise ValueError("Uncertainty analysis needs at least one calculated row")
+    pairs = pd.MultiIndex.from_arrays([df['material'], df['material_type']])
+    factor_codes, unique_pairs = pairs.factorize()
+    factor_means = pd.Series(df['emission_factor'].to_numpy(dtype=float)).groupby(factor_codes).first()
+    known = unique_pairs.isin(factor_table.index)
+    factor_cv = np.array([FACTOR_CV.get(material, DEFAULT_FACTOR_CV) if is_known else UNKNOWN_FACTOR_CV
+                          for (material, _), is_known in zip(unique_pairs, known)])
+    factor_mu, factor_sigma = lognormal_params(factor_means.to_numpy(), factor_cv)
+
+    # Cells: rows sharing an emission factor and every grouped value
+    columns = [column for column in group_by if column in df.columns]
+    codes = {'factor': factor_codes}
+    labels = {}
+    for column in columns:
+        codes[column], values = pd.factorize(df[column].astype(object).where(df[column].notna(), MISSING))
+        labels[column] = list(values)
+    frame = pd.DataFrame(codes)
+    cell_codes = frame.groupby(list(frame.columns), sort=False).ngroup().to_numpy()
+    order = np.argsort(cell_codes, kind='stable')
+    cell_starts = np.searchsorted(cell_codes[order], np.arange(cell_codes.max() + 1))
+    cells = frame.iloc[order[cell_starts]]
+
+    indicators = {}
+    for column in columns:
+        indicator = np.zeros((len(cells), len(labels[column])))
+        indicator[np.arange(len(cells)), cells[column].to_numpy()] = 1.0
+        indicators[column] = indicator
+
+    density_mu, density_sigma = lognormal_params(df['density'].to_numpy(dtype=float)[order], density_cv)
+    return {
+        'cell_starts': cell_starts,
+        'cell_factors': cells['factor'].to_numpy(),
+        'factor_mu': factor_mu,
+        'factor_sigma': factor_sigma,
+        'density_mu': density_mu,
+        'density_sigma': density_sigma,
+        'volume': df['volume'].to_numpy(dtype=float)[order],
+        'point': df['carbon_emissions'].to_numpy(dtype=float),
+        'row_codes': {column: codes[column] for column in columns},
+        'indicators': indicators,
+        'labels': labels,
+    }
+
+
+def simulate(model, iterations, seed):
+    """
+    Simulate a batch of iterations.
+
+    Returns:
+        dict: Total emissions per iteration, and emissions per iteration and group
+            (an iterations x groups matrix) for every grouped column.
+    """
+    rng = np.random.default_rng(seed)
+    factors = np.exp(model['factor_mu'] + model['factor_sigma'] * rng.standard_normal((iterations, len(model['factor_mu']))))
+    mass = np.exp(model['density_mu'] + model['density_sigma'] * rng.standard_normal((iterations, len(model['volume']))))
+    mass *= model['volume']
+    emissions = np.add.reduceat(mass, model['cell_starts'], axis=1) * factors[:, model['cell_factors']]
+    samples = {column: emissions @ indicator for column, indicator in model['indicators'].items()}
+    samples['total'] = emissions.sum(axis=1)
+    return samples
+
+
+def _init_worker(model):
+    global _worker_model
+    _worker_model = model
+
+
+def _simulate_batch(task):
+    iterations, seed = task
+    return simulate(_worker_model, iterations, seed)
+
+
+def summarize(samples, point, labels, confidence=CONFIDENCE):
+    """Mean, spread and confidence interval of each column of an (iterations x groups) sample matrix."""
+    tail = (1 - confidence) / 2 * 100
+    low, median, high = np.percentile(samples, [tail, 50, 100 - tail], axis=0)
+    return pd.DataFrame({
+        'point_estimate': point,
+        'mean': samples.mean(axis=0),
+        'std': samples.std(axis=0),
+        'ci_low': low,
+        'median': median,
+        'ci_high': high,
+    }, index=labels)
+
+
+def run_monte_carlo(df, factor_table, iterations=DEFAULT_ITERATIONS, group_by=UNCERTAINTY_GROUPS,
+                    density_cv=DENSITY_CV, confidence=CONFIDENCE, workers=None, seed=None):
+    """
+    Monte Carlo confidence intervals of the carbon emissions of calculated rows.
+
+    Args:
+        df (DataFrame): Rows from HyperbuildingCarbonAnalyzer.calculate_emissions_frame.
+        factor_table (Series): Emission factors indexed by (material, material_type).
+        iterations (int): Number of simulated iterations.
+        group_by (tuple): Columns to report confidence intervals for.
+        density_cv (float): Coefficient of variation of every density.
+        confidence (float): Width of the reported intervals.
+        workers (int): Worker processes, 1 simulates in this process. Defaults to the CPU count.
+        seed (int): Seed for reproducible results.
+
+    Returns:
+        dict: iterations, workers, seconds, confidence and summaries (a DataFrame per
+            grouped column, plus 'total').
+
+    Raises:
+        ValueError: If df has no rows.
+    """
+    started = time.perf_counter()
+    model = build_model(df, factor_table, group_by, density_cv)
+    batch = max(1, min(iterations, BATCH_ELEMENTS // max(1, len(df))))
+    sizes = [min(batch, iterations - start) for start in range(0, iterations, batch)]
+    # Independent random streams per batch, the result does not depend on the worker count
+    tasks = list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+
+    if workers <= 1:
+        results = [simulate(model, size, batch_seed) for size, batch_seed in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model,)) as pool:
+            results = list(pool.map(_simulate_batch, tasks))
+
+    summaries = {
+        'total': summarize(np.concatenate([r['total'] for r in results])[:, None],
+                           [model['point'].sum()], ['total'], confidence),
+    }
+    for column, codes in model['row_codes'].items():
+        point = np.bincount(codes, weights=model['point'], minlength=len(model['labels'][column]))
+        summaries[column] = summarize(np.concatenate([r[column] for r in results]),
+                                      point, model['labels'][column], confidence)
+    return {
+        'iterations': iterations,
+        'workers': workers,
+        'seconds': time.perf_counter() - started,
+        'confidence': confidence,
+        'summaries': summaries,
+    }
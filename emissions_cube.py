@@ -0,0 +1,140 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+# Precomputed aggregation cube of calculated emissions.
+# Mass, carbon emissions and row counts are summed once per dataset for every
+# combination of dimension values, subtotals included (a rolled-up dimension holds ALL).
+# Any slice or drill-down is then a dictionary lookup instead of a groupby over the rows.
+
+CUBE_DIMENSIONS = ('building_name', 'component', 'material', 'material_type', 'location')
+CUBE_MEASURES = ('mass', 'carbon_emissions', 'rows')
+MISSING = '(none)'  # Value of a dimension a record does not have
+
+
+class _RolledUp:
+    """Value of a rolled-up dimension in cube keys, never equal to a real dimension value."""
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'ALL'
+
+    def __reduce__(self):
+        # Unpickles as the module's single instance
+        return 'ALL'
+
+
+ALL = _RolledUp()
+
+
+class EmissionsCube:
+    """
+    Totals of mass, carbon emissions and rows for every combination of dimension values.
+
+    Args:
+        dimensions (tuple): Columns to aggregate by, in drill-down order.
+    """
+    def __init__(self, dimensions=CUBE_DIMENSIONS):
+        self.dimensions = tuple(dimensions)
+        self.cells = {}
+        # (parent cell, dimension) -> cells one level down that dimension
+        self._children = {}
+        self._rollups = list(itertools.product((False, True), repeat=len(self.dimensions)))
+
+    @classmethod
+    def from_frame(cls, df, dimensions=CUBE_DIMENSIONS):
+        """Build a cube from calculated rows (with mass and carbon_emissions columns)."""
+        cube = cls(dimensions)
+        cube.add_frame(df)
+        return cube
+
+    def __len__(self):
+        return len(self.cells)
+
+    def add_frame(self, df):
+        """
+        Add calculated rows to the cube, so a dataset can be aggregated chunk by chunk.
+
+        The rows are grouped once over all dimensions, and every subtotal is rolled up
+        from those groups rather than from the rows.
+        """
+        if df.empty:
+            return
+        frame = pd.DataFrame(index=df.index)
+        for dimension in self.dimensions:
+            if dimension in df.columns:
+                frame[dimension] = df[dimension].astype(object).where(df[dimension].notna(), MISSING).astype(str)
+            else:
+                frame[dimension] = MISSING
+        frame['mass'] = df['mass'].to_numpy(dtype=float)
+        frame['carbon_emissions'] = df['carbon_emissions'].to_numpy(dtype=float)
+        frame['rows'] = 1.0
+        base = frame.groupby(list(self.dimensions), sort=False)[list(CUBE_MEASURES)].sum()
+
+        for rolled in self._rollups:
+            kept = [dimension for dimension, is_rolled in zip(self.dimensions, rolled) if not is_rolled]
+            if kept:
+                sums = base.groupby(level=kept, sort=False).sum()
+                groups = sums.index if len(kept) > 1 else ((value,) for value in sums.index)
+            else:
+                sums = base.sum().to_frame().T
+                groups = [()]
+            for values, measures in zip(groups, sums.to_numpy()):
+                values = iter(values)
+                self._add(tuple(ALL if is_rolled else next(values) for is_rolled in rolled), measures)
+
+    def _add(self, key, measures):
+        cell = self.cells.get(key)
+        if cell is not None:
+            cell += measures
+            return
+        self.cells[key] = np.array(measures, dtype=float)
+        for i, dimension in enumerate(self.dimensions):
+            if key[i] is not ALL:
+                parent = key[:i] + (ALL,) + key[i + 1:]
+                self._children.setdefault((parent, dimension), []).append(key)
+
+    def key(self, **filters):
+        """Cell key of the slice where the given dimensions are fixed and the others rolled up."""
+        unknown = set(filters) - set(self.dimensions)
+        if unknown:
+            raise ValueError(f"Unknown cube dimensions: {sorted(unknown)}")
+        values = (filters.get(dimension, ALL) for dimension in self.dimensions)
+        return tuple(value if value is ALL else str(value) for value in values)
+
+    def total(self, **filters):
+        """
+        Totals of one slice, e.g. total(building_name='Tower A', component='structural_core').
+
+        Returns:
+            dict: mass, carbon_emissions and rows, zero for slices without rows.
+        """
+        cell = self.cells.get(self.key(**filters))
+        return dict(zip(CUBE_MEASURES, (0.0, 0.0, 0) if cell is None else (float(cell[0]), float(cell[1]), int(cell[2]))))
+
+    def children(self, dimension, **filters):
+        """
+        Drill down from a slice along one dimension.
+
+        Args:
+            dimension (str): Dimension to break the slice down by, must not be in filters.
+            **filters: Fixed dimension values of the slice.
+
+        Returns:
+            DataFrame: mass, carbon_emissions and rows per value of the dimension,
+                largest emissions first.
+        """
+        if dimension in filters:
+            raise ValueError(f"{dimension} is already fixed in the slice")
+        position = self.dimensions.index(dimension)
+        keys = self._children.get((self.key(**filters), dimension), [])
+        table = pd.DataFrame([self.cells[key] for key in keys], columns=list(CUBE_MEASURES),
+                             index=pd.Index([key[position] for key in keys], name=dimension))
+        table['rows'] = table['rows'].astype(int)
+        return table.sort_values('carbon_emissions', ascending=False)
+
+    def values(self, dimension, **filters):
+        """Values of a dimension present in a slice, sorted."""
+        position = self.dimensions.index(dimension)
+        return sorted(key[position] for key in self._children.get((self.key(**filters), dimension), []))
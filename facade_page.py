@@ -1,45 +1,27 @@
 import gradio as gr
-from specklepy.api.client import SpeckleClient
-from specklepy.api.credentials import get_account_from_token
 import pandas as pd
-import plotly.express as px
-from config import speckle_token
-
-# Initialize Speckle client and credentials
-speckle_server = "macad.speckle.xyz"
-client = SpeckleClient(host=speckle_server)
-account = get_account_from_token(speckle_token, speckle_server)
-client.authenticate_with_account(account)
-
-# Project ID
-project_id = "28a211b286"
-project = client.project.get_with_models(project_id=project_id, models_limit=100)
-
-# Filter models whose names start with 'structure/'
-# models = [item for item in project.models.items]
-models = [item for item in project.models.items if item.name.startswith('facade')]
-model = [item for item in project.models.items if item.name.startswith('facade/final panelisation')][0]  # Select the first model
-models_name = [m.name for m in models]  # Extract model names
-model_name = model.name  # Select the first model
-versions = client.version.get_versions(model_id=model.id, project_id=project.id, limit=100).items
-version = versions[0]  # Select the first version
-
-model_massing = [item for item in project.models.items if item.name.startswith('structure/share/towers/v3/column')][0]
-version_massing = client.version.get_versions(model_id=model_massing.id, project_id=project.id, limit=100).items[0]
+from speckle_session import project_id
+from project_snapshot import find_model, latest_version, models_for_team, models_with_prefix
+from sheets import read_sheet
+from offline_bundle import cached_figure
+from lazy_page import LazyPage
+from sheet_registry import FACADE_TYPES, sheet_breakdown
+from kpis import FACADE_METRICS
 
 ##################################################
 
 def version_name(model, version):
     timestamp = model.createdAt.strftime("%Y-%m-%d %H:%M:%S")
-    return ' - '.join([version.authorUser.name, timestamp, version.message])
+    return ' - '.join([version["author"], timestamp, version["message"]])
 
 def create_viewer_url(model, version):
-    embed_src = f"https://macad.speckle.xyz/projects/{project_id}/models/{model.id}@{version.id}#embed=%7B%22isEnabled%22%3Atrue%2C%7D"
+    embed_src = f"https://macad.speckle.xyz/projects/{project_id}/models/{model.id}@{version['id']}#embed=%7B%22isEnabled%22%3Atrue%2C%7D"
     iframe = f'<iframe src="{embed_src}" style="width:100%; height:750px; border:none;"></iframe>'
     return iframe
 
 # Plotting functions
 def plot_pie_chart(types_list, values_list):
+    import plotly.express as px
     df = pd.DataFrame({
         'facade type': types_list,
         'percentage': values_list,
@@ -74,22 +56,31 @@ def plot_pie_chart(types_list, values_list):
 
 ##################################################
 
-sheet_csv_url1 = "https://docs.google.com/spreadsheets/d/1Ju7wDVKEIBMoE5DzkIIKqYtXg5rmnVC-52HSGhMYdew/export?format=csv&gid=451167349"
-df1 = pd.read_csv(sheet_csv_url1)
-bar1 = plot_pie_chart(df1['NAME'][:-1].tolist(), df1['%'][:-1].tolist())
+sheet_csv_url1 = FACADE_TYPES
 
 def highlight_last_row(s):
     color = 'rgba(101, 44, 179, 0.25)'  # Light blue with 50% transparency
     return [f'background-color: {color}' if i == s.index[-1] else '' for i in s.index]
 
-# Apply the highlighting
-styler = df1.style.apply(highlight_last_row, axis=0)
+# Everything the page shows, loaded the first time the Facade tab is selected
+def load_data():
+    models = models_for_team("Facade")
+    df1 = read_sheet(sheet_csv_url1)
+    bar1 = cached_figure("facade/bar1", lambda: plot_pie_chart(*sheet_breakdown(df1, sheet_csv_url1, '%')))
+    return {
+        "models_name": [m.name for m in models],  # Extract model names
+        "model": models_with_prefix('facade/final panelisation')[0],  # Select the first model
+        "styler": df1.style.apply(highlight_last_row, axis=0),  # Apply the highlighting
+        "figure": bar1,
+    }
+
+page = LazyPage("facade", load_data, sheets=[sheet_csv_url1])
 
 
 ##################################################
 
 # Metrics cards in a row with matching style to your dashboard
-metric1_html = """
+metric1_html = f"""
 <div style="padding: 20px; font-family: 'Roboto Mono', monospace;">
     <!-- Import Roboto Mono font -->
     <link href="https://fonts.googleapis.com/css2?family=Roboto+Mono:wght@400;500;700&display=swap" rel="stylesheet">
@@ -104,7 +95,7 @@ metric1_html = """
                 ENERGY GENERATION
             </div>
             <div style="color: #ffffff; font-size: 28px; font-weight: 700; letter-spacing: 0.5px; font-family: 'Roboto Mono', monospace;">
-                57.2%
+                {FACADE_METRICS['energy_generation_pct']}%
             </div>
         </div>
 
@@ -116,8 +107,8 @@ metric1_html = """
 # GRADIO UI
 with gr.Blocks() as f_demo:
     with gr.Row(equal_height=True):
-        model_dropdown = gr.Dropdown(choices=models_name, label="Select Facade Team Model", value = model_name)
-        version_text = gr.Textbox(value = version_name(model, version), info="Last version of selected model was sent by ", container=False, lines=2)
+        model_dropdown = gr.Dropdown(label="Select Facade Team Model")
+        version_text = gr.Textbox(info="Last version of selected model was sent by ", container=False, lines=2)
     with gr.Row(equal_height=True):
         with gr.Column():
             viewer_iframe = gr.HTML()
@@ -129,24 +120,30 @@ with gr.Blocks() as f_demo:
     gr.Markdown("## KPI: Energy generation", container=True)
     with gr.Row():
         with gr.Column(scale=1.5):
-            gr.DataFrame(value=styler, label="Facade Distribution Data", interactive=False, show_fullscreen_button = True, max_height=1000, column_widths=[90,10, 15, 15])
+            table = gr.DataFrame(label="Facade Distribution Data", interactive=False, show_fullscreen_button = True, max_height=1000, column_widths=[90,10, 15, 15])
             gr.HTML(metric1_html)
         with gr.Column():
-            gr.Plot(bar1, container=False, show_label=False)
+            plot = gr.Plot(container=False, show_label=False)
 
     # Load spekcle viewer
-    def initialize_app():
-        viewer_url = create_viewer_url(model, version)
+    def initialize_app(model):
+        viewer_url = create_viewer_url(model, latest_version(model.id))
         return viewer_url
 
+    def fill_page(page_data):
+        model = page_data["model"]
+        return [gr.Dropdown(choices=page_data["models_name"], value=model.name), version_name(model, latest_version(model.id)),
+                page_data["styler"], page_data["figure"], initialize_app(model)]
+
 
-    f_demo.load(fn=initialize_app, outputs=[viewer_iframe])
+    # Filled when the tab is first selected (see app.py)
+    page.bind([model_dropdown, version_text, table, plot, viewer_iframe], fill_page)
 
     def handle_model_change(selected_model_name):
-        selected_model = next((m for m in models if m.name == selected_model_name), None)
+        selected_model = find_model(selected_model_name)
         if not selected_model:
             return '<p>Model not found</p>'
-        version = client.version.get_versions(model_id=selected_model.id, project_id=project.id, limit=5).items[0]
+        version = latest_version(selected_model.id)
         return create_viewer_url(selected_model, version), version_name(selected_model, version)
 
 
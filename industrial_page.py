@@ -1,9 +1,9 @@
 import gradio as gr
-from specklepy.api.client import SpeckleClient
-from specklepy.api.credentials import get_account_from_token
 import pandas as pd
-import plotly.express as px
-from config import speckle_token
+from speckle_session import project_id
+from project_snapshot import find_model, latest_version, models_for_team, models_with_prefix
+from lazy_page import LazyPage
+from kpis import INDUSTRIAL_METRICS, spaced
 
 # Custom CSS for font and hiding scrollbars
 custom_css = """
@@ -43,7 +43,7 @@ body, h1, h2, h3, p, div, span, button, input, select, textarea {
 """
 
 # Metrics cards in a row with matching style to your dashboard
-metrics_html = """
+metrics_html = f"""
 <div style="padding: 20px; font-family: 'Roboto Mono', monospace;">
     <!-- Import Roboto Mono font -->
     <link href="https://fonts.googleapis.com/css2?family=Roboto+Mono:wght@400;500;700&display=swap" rel="stylesheet">
@@ -58,7 +58,7 @@ metrics_html = """
                 NUMBER OF AQUAPONICS COLUMNS
             </div>
             <div style="color: #ffffff; font-size: 28px; font-weight: 700; letter-spacing: 0.5px; font-family: 'Roboto Mono', monospace;">
-                13 403
+                {spaced(INDUSTRIAL_METRICS['aquaponics_columns'])}
             </div>
         </div>
         
@@ -69,7 +69,7 @@ metrics_html = """
                 NUMBER OF PLANTERS
             </div>
             <div style="color: #ffffff; font-size: 28px; font-weight: 700; letter-spacing: 0.5px; font-family: 'Roboto Mono', monospace;">
-                603 135
+                {spaced(INDUSTRIAL_METRICS['planters'])}
             </div>
         </div>
         
@@ -80,7 +80,7 @@ metrics_html = """
                 TOTAL GROWING AREA
             </div>
             <div style="color: #ffffff; font-size: 28px; font-weight: 700; letter-spacing: 0.5px; font-family: 'Roboto Mono', monospace;">
-                18 948 m²
+                {spaced(INDUSTRIAL_METRICS['growing_area_m2'])} m²
             </div>
         </div>
         
@@ -91,7 +91,7 @@ metrics_html = """
                 TOTAL FISHTANK VOLUME
             </div>
             <div style="color: #ffffff; font-size: 28px; font-weight: 700; letter-spacing: 0.5px; font-family: 'Roboto Mono', monospace;">
-                3 789 m³
+                {spaced(INDUSTRIAL_METRICS['fishtank_volume_m3'])} m³
             </div>
         </div>
 
@@ -100,7 +100,7 @@ metrics_html = """
 """
 
 # Metrics cards in a row with matching style to your dashboard
-metric1_html = """
+metric1_html = f"""
 <div style="padding: 20px; font-family: 'Roboto Mono', monospace;">
     <!-- Import Roboto Mono font -->
     <link href="https://fonts.googleapis.com/css2?family=Roboto+Mono:wght@400;500;700&display=swap" rel="stylesheet">
@@ -115,7 +115,7 @@ metric1_html = """
                 LOCAL FOOD FED RESIDENTS
             </div>
             <div style="color: #ffffff; font-size: 28px; font-weight: 700; letter-spacing: 0.5px; font-family: 'Roboto Mono', monospace;">
-                87.2%
+                {INDUSTRIAL_METRICS['local_food_fed_residents_pct']}%
             </div>
         </div>
 
@@ -123,35 +123,27 @@ metric1_html = """
 </div>
 """
 
-# Initialize Speckle client and credentials
-speckle_server = "macad.speckle.xyz"
-client = SpeckleClient(host=speckle_server)
-account = get_account_from_token(speckle_token, speckle_server)
-client.authenticate_with_account(account)
-
-# Project ID
-project_id = "28a211b286"
-project = client.project.get_with_models(project_id=project_id, models_limit=100)
-
-# Filter models whose names start with 'structure/'
-# models = [item for item in project.models.items]
-models = [item for item in project.models.items if item.name.startswith('industrial')]
-model = [item for item in project.models.items if item.name.startswith('industrial/podium/full')][0]  # Select the first model
-models_name = [m.name for m in models]  # Extract model names
-model_name = model.name  # Select the first model
-versions = client.version.get_versions(model_id=model.id, project_id=project.id, limit=100).items
-version = versions[0]  # Select the first version
+# Everything the page shows, loaded the first time the Industrial tab is selected
+def load_data():
+    models = models_for_team("Industrial")
+    return {
+        "models_name": [m.name for m in models],  # Extract model names
+        "model": models_with_prefix('industrial/podium/full')[0],  # Select the first model
+    }
+
+page = LazyPage("industrial", load_data)
 
 def version_name(model, version):
     timestamp = model.createdAt.strftime("%Y-%m-%d %H:%M:%S")
-    return ' - '.join([version.authorUser.name, timestamp, version.message])
+    return ' - '.join([version["author"], timestamp, version["message"]])
 
 def create_viewer_url(model, version):
-    embed_src = f"https://macad.speckle.xyz/projects/{project_id}/models/{model.id}@{version.id}#embed=%7B%22isEnabled%22%3Atrue%2C%7D"
+    embed_src = f"https://macad.speckle.xyz/projects/{project_id}/models/{model.id}@{version['id']}#embed=%7B%22isEnabled%22%3Atrue%2C%7D"
     iframe = f'<iframe src="{embed_src}" style="width:100%; height:750px; border:none;"></iframe>'
     return iframe
 
 def plot_pie_chart(value1, value2):
+    import plotly.express as px
     df = pd.DataFrame({
         'category': ['Local food fed residents', 'Residents with combined diet'],
         'values': [value1, value2]
@@ -183,8 +175,8 @@ def plot_pie_chart(value1, value2):
 with gr.Blocks(css=custom_css, theme=gr.themes.Default(primary_hue="indigo", text_size="lg")) as i_demo:
 
     with gr.Row(equal_height=True):
-            model_dropdown = gr.Dropdown(choices=models_name, label="Select Industrial Team Model", value = model_name)
-            version_text = gr.Textbox(value = version_name(model, version), info="Last version of selected model was sent by ", container=False, lines=2)
+            model_dropdown = gr.Dropdown(label="Select Industrial Team Model")
+            version_text = gr.Textbox(info="Last version of selected model was sent by ", container=False, lines=2)
     with gr.Row(equal_height=True):
         with gr.Column():
             viewer_iframe = gr.HTML()
@@ -203,11 +195,11 @@ with gr.Blocks(css=custom_css, theme=gr.themes.Default(primary_hue="indigo", tex
     with gr.Row(equal_height=True):
         with gr.Column(variant='compact'):
             gr.HTML(metric1_html)
-            gr.Number(label='People fed with local production', value=5413)
-            gr.Number(label='Growing area in m² per person', value=3.5)
-            gr.Textbox(label='Growing area to fishtank volume', value='5:1')
-            value1 = gr.Number(label="People having local food diet", value=87.2, visible=False)
-            value2 = gr.Number(label="Others)", value=12.8, visible=False)
+            gr.Number(label='People fed with local production', value=INDUSTRIAL_METRICS['people_fed_locally'])
+            gr.Number(label='Growing area in m² per person', value=INDUSTRIAL_METRICS['growing_area_per_person_m2'])
+            gr.Textbox(label='Growing area to fishtank volume', value=INDUSTRIAL_METRICS['growing_area_to_fishtank_volume'])
+            value1 = gr.Number(label="People having local food diet", value=INDUSTRIAL_METRICS['local_food_fed_residents_pct'], visible=False)
+            value2 = gr.Number(label="Others)", value=round(100 - INDUSTRIAL_METRICS['local_food_fed_residents_pct'], 2), visible=False)
         
 
         with gr.Column(scale=2):
@@ -215,22 +207,28 @@ with gr.Blocks(css=custom_css, theme=gr.themes.Default(primary_hue="indigo", tex
             
 
     # Load spekcle viewer
-    def initialize_app():
-        viewer_url = create_viewer_url(model, version)
+    def initialize_app(model):
+        viewer_url = create_viewer_url(model, latest_version(model.id))
         return viewer_url
 
+    def fill_page(page_data):
+        model = page_data["model"]
+        return [gr.Dropdown(choices=page_data["models_name"], value=model.name), version_name(model, latest_version(model.id)),
+                initialize_app(model)]
+
 
-    i_demo.load(fn=initialize_app, outputs=[viewer_iframe])
+    # Filled when the tab is first selected (see app.py)
+    page.bind([model_dropdown, version_text, viewer_iframe], fill_page)
     
 
     # Automatically generate plots
     i_demo.load(plot_pie_chart, inputs=[value1, value2], outputs=output1)
 
     def handle_model_change(selected_model_name):
-        selected_model = next((m for m in models if m.name == selected_model_name), None)
+        selected_model = find_model(selected_model_name)
         if not selected_model:
             return '<p>Model not found</p>'
-        version = client.version.get_versions(model_id=selected_model.id, project_id=project.id, limit=5).items[0]
+        version = latest_version(selected_model.id)
         return create_viewer_url(selected_model, version), version_name(selected_model, version)
 
 
@@ -0,0 +1,279 @@
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from sheets import read_sheet
+from sheet_registry import (RESIDENTIAL_UNITS, SERVICE_AREAS, SERVICE_AMENITIES, SERVICE_OPEN_SPACE, FACADE_TYPES,
+                            STRUCTURE_WIND_LOADS, sheet_breakdown, sheet_rows)
+
+# Key performance indicators of every team, computed without building any Gradio UI.
+# Values the teams measured outside the dashboard are kept here as constants and shown
+# by the page cards, the rest is derived from the team sheets and the Speckle history.
+# `python kpis.py [report.json|report.parquet]` writes all of them into one report.
+
+logger = logging.getLogger(__name__)
+
+default_report_path = "kpi_report.json"
+
+BUILDING_METRICS = {
+    "tower_gfa_m2": 450000,
+    "tallest_tower_height_m": 280,
+    "tallest_tower_floors": 60,
+    "inhabitants": 6208,
+    "lowest_tower_height_m": 200,
+    "lowest_tower_floors": 48,
+}
+
+RESIDENTIAL_VIEWS = {
+    "best_views_pct": 6,
+    "premium_views_pct": 2.51,
+    "pleasant_views_pct": 43.02,
+    "average_views_pct": 48.46,
+}
+
+RESIDENTIAL_DAYLIGHT = {
+    "high_daylight_pct": 1.16,
+    "medium_daylight_pct": 10.77,
+    "low_daylight_pct": 44.22,
+    "extremely_low_daylight_pct": 43.85,
+}
+
+SERVICE_METRICS = {
+    "open_area_per_person_m2": 11.11,
+    "open_area_per_person_increase_pct": 33,
+    "average_amenity_travel_time_s": 585,
+    "average_amenity_travel_time_reduction_pct": 25,
+}
+
+INDUSTRIAL_METRICS = {
+    "aquaponics_columns": 13403,
+    "planters": 603135,
+    "growing_area_m2": 18948,
+    "fishtank_volume_m3": 3789,
+    "local_food_fed_residents_pct": 87.2,
+    "people_fed_locally": 5413,
+    "growing_area_per_person_m2": 3.5,
+    "growing_area_to_fishtank_volume": "5:1",
+}
+
+FACADE_METRICS = {
+    "energy_generation_pct": 57.2,
+}
+
+STRUCTURE_METRICS = {
+    "average_wind_load_reduction_pct": 16.5,
+}
+
+# Program areas in m² of the podium and the four towers
+PODIUM_PROGRAM = pd.DataFrame({
+    "Category": ["Transport & Logistics", "Food Production", "Energy Production", "Parking & Service Areas"],
+    "Values": [55712, 24373, 24373, 20891],
+    "Sub-Category": ["Service", "Industrial", "Industrial", "Service"],
+})
+
+TOWER_PROGRAMS = [
+    pd.DataFrame({
+        "Category": ["Studio", "1-Bedroom", "Circulation", "Amenities", "Retail", "Green Spaces"],
+        "Values": [72892.94, 90356.87, 127061.15, 121488.23, 60744.12, 18982.54],
+        "Sub-Category": ["Residential", "Residential","Residential", "Services", "Services", "Services"],
+    }),
+    pd.DataFrame({
+        "Category": ["1-Bedroom", "2-Bedroom", "3-Bedroom", "Circulation",
+                     "4-Bedroom","Amenities", "Green Spaces", "Retail"],
+        "Values": [90356.87, 82763.86, 48595.29, 64540.62, 121488.23, 60744.12, 127061.15, 18982.54],
+        "Sub-Category": ["Residential", "Residential", "Residential", "Residential",
+                     "Residential","Services", "Services", "Services"],
+    }),
+    pd.DataFrame({
+        "Category": ["2-Bedroom", "3-Bedroom",
+                     "4-Bedroom","Penthouse", "Circulation", "Amenities", "Green Spaces",  "Retail"],
+        "Values": [82763.86, 48595.29, 64540.62, 17463.93, 121488.23, 60744.12, 127061.15, 18982.54],
+        "Sub-Category": ["Residential", "Residential",
+                     "Residential","Residential", "Residential", "Services", "Services", "Services"],
+    }),
+    pd.DataFrame({
+        "Category": ["Olympic Gymnasium", "Co-Working Space",
+                     "Circulation","Retail", "Education", "Hospital & Wellness", "Commercial & Mixed-Use"],
+        "Values": [37965.07, 22779.04, 127061.15, 18982.54, 212614, 9111.62, 7593.01],
+        "Sub-Category": ["Services", "Services",
+                     "Services","Services", "Services", "Services", "Services"]
+    }),
+]
+
+
+def spaced(value):
+    """Format a number with spaces as thousands separators, as on the metric cards."""
+    return f"{value:,}".replace(",", " ")
+
+
+def _numbers(values):
+    # Sheet cells may carry units or thousands separators
+    cleaned = pd.Series(values, dtype=object).astype(str).str.replace(r"[^\d.\-]", "", regex=True)
+    return pd.to_numeric(cleaned, errors="coerce").fillna(0)
+
+
+def _breakdown(df, url, column):
+    names, values = sheet_breakdown(df, url, column)
+    return {str(name): round(float(value), 2) for name, value in zip(names, _numbers(values))}
+
+
+def _total(df, url, column):
+    return round(float(_numbers(sheet_rows(df, url)[column]).sum()), 2)
+
+
+def residential_kpis():
+    units = read_sheet(RESIDENTIAL_UNITS)
+    return {
+        **RESIDENTIAL_VIEWS,
+        **RESIDENTIAL_DAYLIGHT,
+        "units": _breakdown(units, RESIDENTIAL_UNITS, "QUANTITY"),
+        "unit_area_m2": _breakdown(units, RESIDENTIAL_UNITS, "AREA"),
+        "population": _breakdown(units, RESIDENTIAL_UNITS, "POPULATION"),
+        "total_units": _total(units, RESIDENTIAL_UNITS, "QUANTITY"),
+        "total_unit_area_m2": _total(units, RESIDENTIAL_UNITS, "AREA"),
+        "total_population": _total(units, RESIDENTIAL_UNITS, "POPULATION"),
+    }
+
+
+def service_kpis():
+    areas = read_sheet(SERVICE_AREAS)
+    amenities = read_sheet(SERVICE_AMENITIES)
+    open_space = read_sheet(SERVICE_OPEN_SPACE)
+    travel_times = _numbers(sheet_rows(amenities, SERVICE_AMENITIES)["time, min"])
+    return {
+        **SERVICE_METRICS,
+        "area_m2": _breakdown(areas, SERVICE_AREAS, "Area, sq.m."),
+        "total_area_m2": _total(areas, SERVICE_AREAS, "Area, sq.m."),
+        "amenity_travel_time_min": _breakdown(amenities, SERVICE_AMENITIES, "time, min"),
+        "mean_amenity_travel_time_min": round(float(travel_times.mean()), 2) if len(travel_times) else None,
+        "open_area_m2": _breakdown(open_space, SERVICE_OPEN_SPACE, "Area, sq.m."),
+        "total_open_area_m2": _total(open_space, SERVICE_OPEN_SPACE, "Area, sq.m."),
+    }
+
+
+def industrial_kpis():
+    return dict(INDUSTRIAL_METRICS)
+
+
+def facade_kpis():
+    types = read_sheet(FACADE_TYPES)
+    return {
+        **FACADE_METRICS,
+        "facade_type_pct": _breakdown(types, FACADE_TYPES, "%"),
+    }
+
+
+def structure_kpis():
+    wind_loads = read_sheet(STRUCTURE_WIND_LOADS)
+    reductions = _numbers(sheet_rows(wind_loads, STRUCTURE_WIND_LOADS)["Reduction, %"])
+    return {
+        **STRUCTURE_METRICS,
+        "wind_load_reduction_pct": _breakdown(wind_loads, STRUCTURE_WIND_LOADS, "Reduction, %"),
+        "mean_wind_load_reduction_pct": round(float(reductions.mean()), 2) if len(reductions) else None,
+    }
+
+
+def program_kpis():
+    # Imported here so sheet-only reports do not need a Speckle connection
+    from project_snapshot import get_snapshot, team_for_model
+    from version_store import get_version_table
+
+    project = get_snapshot().project
+    versions = get_version_table()
+    counts = versions["model_id"].value_counts()
+    commits_per_team = {}
+    for m in project.models.items:
+        team = team_for_model(m.name)
+        commits_per_team[team] = commits_per_team.get(team, 0) + int(counts.get(m.id, 0))
+    return {
+        **BUILDING_METRICS,
+        "podium_area_m2": round(float(PODIUM_PROGRAM["Values"].sum()), 2),
+        "tower_area_m2": {f"Tower {i}": round(float(b["Values"].sum()), 2) for i, b in enumerate(TOWER_PROGRAMS, 1)},
+        "models": len(project.models.items),
+        "commits": len(versions),
+        "commits_per_team": commits_per_team,
+        "contributors": int(versions["author"].nunique()),
+        "connectors": {str(k): int(v) for k, v in versions["sourceApplication"].value_counts().items()},
+    }
+
+
+TEAM_KPIS = {
+    "Program": program_kpis,
+    "Residential": residential_kpis,
+    "Service": service_kpis,
+    "Industrial": industrial_kpis,
+    "Facade": facade_kpis,
+    "Structure": structure_kpis,
+}
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    try:
+        return fn(), None, time.perf_counter() - started
+    except Exception as error:
+        logger.warning("KPI computation %s failed", fn.__name__, exc_info=True)
+        return None, f"{type(error).__name__}: {error}", time.perf_counter() - started
+
+
+def compute_kpis(teams=None, max_workers=None):
+    """Compute the KPIs of every team (or the given teams) concurrently.
+
+    Returns:
+        dict: Report with the KPIs per team, the seconds each team took and the errors
+            of the teams that could not be computed.
+    """
+    teams = list(TEAM_KPIS) if teams is None else list(teams)
+    with ThreadPoolExecutor(max_workers=max_workers or len(teams), thread_name_prefix="kpi") as pool:
+        results = dict(zip(teams, pool.map(_timed, [TEAM_KPIS[team] for team in teams])))
+    return {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "kpis": {team: kpis for team, (kpis, error, _) in results.items() if error is None},
+        "seconds": {team: round(seconds, 3) for team, (_, _, seconds) in results.items()},
+        "errors": {team: error for team, (_, error, _) in results.items() if error is not None},
+    }
+
+
+def _flatten(prefix, value):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(f"{prefix}.{key}", item)
+    else:
+        yield prefix, value
+
+
+def report_table(report):
+    """Flatten a report into one row per team and KPI, nested KPIs use dotted names."""
+    rows = []
+    for team, kpis in report["kpis"].items():
+        for name, value in kpis.items():
+            for kpi, item in _flatten(name, value):
+                numeric = isinstance(item, (int, float)) and not isinstance(item, bool)
+                rows.append({"team": team, "kpi": kpi, "value": float(item) if numeric else None,
+                             "text": None if numeric or item is None else str(item)})
+    table = pd.DataFrame(rows, columns=["team", "kpi", "value", "text"])
+    table["generated_at"] = report["generated_at"]
+    return table
+
+
+def write_report(report, path=default_report_path):
+    """Write a report as JSON, or as a Parquet table when path ends with .parquet (requires pyarrow)."""
+    if path.endswith(".parquet"):
+        report_table(report).to_parquet(path, index=False)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return path
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    path = sys.argv[1] if len(sys.argv) > 1 else default_report_path
+    report = compute_kpis()
+    print(f"KPI report written to {write_report(report, path)}")
+    for team, seconds in report["seconds"].items():
+        print(f"  {team:<12} {seconds:>7.2f}s  {report['errors'].get(team, 'ok')}")
+    sys.exit(1 if report["errors"] else 0)
@@ -0,0 +1,117 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from project_snapshot import get_snapshot
+from sheets import sheet_digest
+from startup_profile import phase
+
+# Lazily initialised dashboard pages.
+# A page module builds its Blocks without any data at import. The Speckle lookups, sheet
+# reads and figures behind it are loaded the first time its tab is selected, and later
+# sessions fill the tab from that cached result. The cached data is tied to the models and
+# latest versions of the project snapshot and to the content digests of the sheets the page
+# reads: once the background refresher brings new models or versions, or the sheet cache
+# revalidates a sheet to new content, the next select loads the page again and re-fills the
+# sessions showing it.
+# When every tab is needed up front, load_pages loads all of them concurrently instead.
+
+logger = logging.getLogger(__name__)
+
+
+class LazyPage:
+    """Data of one dashboard page, loaded on first use and cached for the process.
+
+    Args:
+        name (str): Page name used in timings and logs.
+        load (callable): Returns the page data.
+        sheets (list): CSV export URLs of the sheets `load` reads, the data is loaded
+            again whenever the content of one of them or the project snapshot changed.
+    """
+
+    def __init__(self, name, load, sheets=()):
+        self.name = name
+        self._load = load
+        self.sheets = list(sheets)
+        self._lock = threading.Lock()
+        # ((snapshot signature, sheet digests), data, generation) of the last load
+        self._loaded = None
+        self.load_seconds = None
+        self.outputs = []
+        self._fill = None
+
+    @property
+    def loaded(self):
+        return self._loaded is not None
+
+    def _current(self):
+        # Sheet reads go through the TTL cache, so this only hits Google once the TTL expired
+        key = (get_snapshot().signature, tuple(sheet_digest(url) for url in self.sheets))
+        loaded = self._loaded
+        if loaded is None or loaded[0] != key:
+            with self._lock:
+                loaded = self._loaded
+                if loaded is None or loaded[0] != key:
+                    started = time.perf_counter()
+                    with phase("page", self.name):
+                        data = self._load()
+                    self.load_seconds = time.perf_counter() - started
+                    loaded = (key, data, 1 if self._loaded is None else self._loaded[2] + 1)
+                    self._loaded = loaded
+        return loaded
+
+    def data(self):
+        """Return the page data, loading it on the first call and when the snapshot or one of its sheets changed."""
+        return self._current()[1]
+
+    def bind(self, outputs, fill):
+        """Register the components filled from the page data and the function returning their values."""
+        self.outputs = list(outputs)
+        self._fill = fill
+
+    def attach(self, tab, load_with=None):
+        """Fill the page components the first time `tab` is selected in a session.
+
+        Must be called inside the Blocks that renders the page. Later selects re-fill the
+        page only when its data was loaded again since.
+
+        Args:
+            tab (gr.Tab): Tab the page is rendered in.
+            load_with (gr.Blocks): Also fill the page as soon as these Blocks load, for pages
+                whose data was loaded up front.
+        """
+        import gradio as gr
+
+        # Generation of the page data this session was filled with, 0 before the first fill
+        filled = gr.State(0)
+
+        def on_select(filled_generation):
+            _, data, generation = self._current()
+            if filled_generation == generation:
+                # Keep whatever the user selected on the page since
+                return [generation] + [gr.update() for _ in self.outputs]
+            return [generation, *self._fill(data)]
+
+        triggers = [tab.select] if load_with is None else [load_with.load, tab.select]
+        gr.on(triggers=triggers, fn=on_select, inputs=filled, outputs=[filled, *self.outputs])
+
+
+def load_pages(pages, max_workers=None):
+    """Load the data of several pages concurrently, each on its own worker thread.
+
+    Startup then waits for the slowest page instead of the sum of all of them.
+
+    Returns:
+        dict: Seconds each page took to load, None for the pages that failed, keyed by page name.
+    """
+    def load(page):
+        try:
+            page.data()
+        except Exception:
+            logger.warning("Could not load page %s", page.name, exc_info=True)
+            return None
+        return page.load_seconds
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(pages), thread_name_prefix="page-load") as pool:
+        return dict(zip([page.name for page in pages], pool.map(load, pages)))
@@ -0,0 +1,131 @@
+import base64
+import gzip
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+from startup_profile import phase
+
+# Offline snapshot bundle.
+# `python offline_bundle.py export [path]` captures everything the dashboard fetches
+# (project model list, latest versions, version history, Google Sheets CSVs and the
+# figures built from them) into one gzip-compressed JSON file. Starting the app with
+# HYPERB_OFFLINE_BUNDLE=<path> then serves all of it from the bundle without any
+# network access.
+
+default_bundle_path = "hyperb_snapshot.json.gz"
+bundle_path = os.environ.get("HYPERB_OFFLINE_BUNDLE")
+
+# Page modules imported by the exporter so that every figure they build is captured
+PAGE_MODULES = ["program", "residential_page", "service_page", "industrial_page", "facade_page", "structural_page"]
+
+_lock = threading.Lock()
+_bundle = None
+_built_figures = {}
+
+
+def is_offline():
+    """True when the dashboard runs from a snapshot bundle instead of the network."""
+    return bool(bundle_path)
+
+
+def load_bundle():
+    """Return the contents of the offline bundle, reading it on first use."""
+    global _bundle
+    with _lock:
+        if _bundle is None:
+            with gzip.open(bundle_path, "rt", encoding="utf-8") as f:
+                _bundle = json.load(f)
+        return _bundle
+
+
+def cached_figure(key, build):
+    """Return the figure stored under key in the bundle when offline, otherwise build it.
+
+    Figures built online are remembered so the exporter can write them into the bundle.
+    """
+    if is_offline():
+        figure_json = load_bundle()["figures"].get(key)
+        if figure_json is not None:
+            import plotly.io as pio
+            return pio.from_json(figure_json)
+    with phase("figure", key):
+        figure = build()
+    _built_figures[key] = figure
+    return figure
+
+
+def bundle_project():
+    """Rebuild the project and its model list from the bundle.
+
+    Models expose the attributes the pages use (id, name, createdAt).
+    """
+    from datetime import datetime
+    project = load_bundle()["project"]
+    models = [SimpleNamespace(id=m["id"], name=m["name"], createdAt=datetime.fromisoformat(m["createdAt"]))
+              for m in project["models"]]
+    return SimpleNamespace(id=project["id"], name=project["name"],
+                           models=SimpleNamespace(items=models, totalCount=len(models), cursor=None))
+
+
+def bundle_sheet(url):
+    """Return the (content bytes, digest) of a sheet stored in the bundle."""
+    sheet = load_bundle()["sheets"].get(url)
+    if sheet is None:
+        raise KeyError(f"Sheet {url} is not in the offline bundle {bundle_path}")
+    return base64.b64decode(sheet["content"]), sheet["digest"]
+
+
+def _version_records(table):
+    records = table.to_dict("records")
+    for record in records:
+        record["createdAt"] = record["createdAt"].isoformat()
+    return records
+
+
+def export_bundle(path=default_bundle_path):
+    """Fetch everything the dashboard needs and write it into an offline bundle."""
+    if is_offline():
+        raise RuntimeError("Unset HYPERB_OFFLINE_BUNDLE to export a fresh bundle")
+
+    from project_snapshot import get_snapshot
+    from version_store import get_version_table
+    from sheets import registered_sheets, prefetch_sheets, sheet_content
+
+    snapshot = get_snapshot()
+    prefetch_sheets()
+    # Loading the pages runs their data pipelines and records every figure they build
+    for module in PAGE_MODULES:
+        importlib.import_module(module).page.data()
+
+    sheets = {}
+    for url in dict.fromkeys(registered_sheets.values()):
+        content, digest = sheet_content(url)
+        sheets[url] = {"content": base64.b64encode(content).decode("ascii"), "digest": digest}
+
+    bundle = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "project": {
+            "id": snapshot.project.id,
+            "name": snapshot.project.name,
+            "models": [{"id": m.id, "name": m.name, "createdAt": m.createdAt.isoformat()}
+                       for m in snapshot.project.models.items],
+        },
+        "latest_versions": _version_records(snapshot.latest_versions),
+        "versions": _version_records(get_version_table()),
+        "sheets": sheets,
+        "figures": {key: figure.to_json() for key, figure in _built_figures.items()},
+    }
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(bundle, f, separators=(",", ":"))
+    return path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "export":
+        sys.exit("usage: python offline_bundle.py export [path]")
+    print(f"Offline bundle written to {export_bundle(*sys.argv[2:3])}")
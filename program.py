@@ -1,74 +1,65 @@
-import gradio as gr
 import pandas as pd
-import plotly.express as px
-from specklepy.api.client import SpeckleClient
-from specklepy.api.credentials import get_account_from_token
-from config import speckle_token
-
-# Initialize Speckle client and credentials
-speckle_server = "macad.speckle.xyz"
-client = SpeckleClient(host=speckle_server)
-account = get_account_from_token(speckle_token, speckle_server)
-client.authenticate_with_account(account)
-
-# Project ID
-# project_id = "daeb18ed0a"
-project_id = "28a211b286" # hyperB project
+from project_snapshot import get_snapshot, team_for_model
+from version_store import get_version_table, versions_for_model
+from sheets import read_sheet
+from sheet_registry import REQUIREMENTS
+from offline_bundle import cached_figure
+from kpis import PODIUM_PROGRAM, TOWER_PROGRAMS
+from lazy_page import LazyPage
 
 
 def get_project_data():
-    project = client.project.get_with_models(project_id=project_id, models_limit=120)
-    return project
+    return get_snapshot().project
 
 def get_all_versions_in_project(project):
-    all_versions = []
-    project = get_project_data()
-    for model in project.models.items:
-        versions = client.version.get_versions(model_id=model.id, project_id=project.id, limit=120).items
-        all_versions.extend(versions)
-    return all_versions
+    # One shared version table (one row per version) for every model in the project
+    return get_version_table()
 
 def update_model_selection(project_data):
+    import gradio as gr
     models = project_data.models.items
     return gr.Dropdown(choices=[m.name for m in models], label="Select Model")
 
 def version_name(version):
-        timestamp = version.createdAt.strftime("%Y-%m-%d %H:%M:%S")
-        return ' - '.join([version.authorUser.name, timestamp, version.message])
+        timestamp = version["createdAt"].strftime("%Y-%m-%d %H:%M:%S")
+        return ' - '.join([version["author"], timestamp, version["message"]])
 
 def update_version_selection(model_name, project_data):
-    models = project_data.models.items
-    selected_model = [m for m in models if m.name == model_name][0]
-    versions = client.version.get_versions(model_id=selected_model.id, project_id=project_data.id, limit=120).items
+    import gradio as gr
+    versions = versions_for_model(model_name)
 
-    return gr.Dropdown(choices=[version_name(v) for v in versions], label="Select Version")
+    return gr.Dropdown(choices=[version_name(v) for _, v in versions.iterrows()], label="Select Version")
 
 def create_viewer_url(model_name, version_key, project_data):
-    models = project_data.models.items
-    selected_model = [m for m in models if m.name == model_name][0]
-    versions = client.version.get_versions(model_id=selected_model.id, project_id=project_data.id, limit=120).items
-    keys = [version_name(v) for v in versions]
-    selected_version = versions[keys.index(version_key)]
+    versions = versions_for_model(model_name)
+    keys = [version_name(v) for _, v in versions.iterrows()]
+    selected_version = versions.iloc[keys.index(version_key)]
 
-    embed_src = f"https://macad.speckle.xyz/projects/{project_data.id}/models/{selected_model.id}@{selected_version.id}#embed=%7B%22isEnabled%22%3Atrue%2C%7D"
+    embed_src = f"https://macad.speckle.xyz/projects/{project_data.id}/models/{selected_version['model_id']}@{selected_version['id']}#embed=%7B%22isEnabled%22%3Atrue%2C%7D"
     return embed_src
 
-def generate_model_statistics(project_data):
-    models = project_data.models.items
-    data = [{"Model Name": m.name, "Total Commits": len(client.version.get_versions(model_id=m.id, project_id=project_data.id, limit=120).items)} for m in models]
-    return pd.DataFrame(data)
+def count_model_commits(project_data, all_versions):
+    # Commit count per model, including models without any version
+    counts = all_versions["model_id"].value_counts()
+    return pd.DataFrame(
+        [[m.name, int(counts.get(m.id, 0))] for m in project_data.models.items],
+        columns=["modelName", "totalCommits"],
+    )
+
+def generate_model_statistics(project_data, all_versions=None):
+    if all_versions is None:
+        all_versions = get_all_versions_in_project(project_data)
+    df = count_model_commits(project_data, all_versions)
+    df.columns = ["Model Name", "Total Commits"]
+    return df
 
 def generate_connector_statistics(all_versions):
-    connector_list = [v.sourceApplication for v in all_versions]
-    df = pd.DataFrame(connector_list, columns=["Connector"])
-    df = df["Connector"].value_counts().reset_index()
+    df = all_versions["sourceApplication"].value_counts().reset_index()
     df.columns = ["Connector", "Usage Count"]
     return df
 
 def generate_contributor_statistics(all_versions):
-    contributors = [v.authorUser.name for v in all_versions]
-    df = pd.DataFrame(contributors, columns=["Contributor"])
-    df = df["Contributor"].value_counts().reset_index()
+    df = all_versions["author"].value_counts().reset_index()
     df.columns = ["Contributor", "Contributions"]
     return df
 
@@ -76,41 +67,23 @@ def generate_contributor_statistics(all_versions):
 def generate_statistics(project_data):
     all_versions = get_all_versions_in_project(project_data)
     
-    model_stats_df = generate_model_statistics(project_data)
+    model_stats_df = generate_model_statistics(project_data, all_versions)
     connector_stats_df = generate_connector_statistics(all_versions)
     contributor_stats_df = generate_contributor_statistics(all_versions)
     
     return model_stats_df, connector_stats_df, contributor_stats_df
 
 def create_graphs(project_data):
-    models = project_data.models.items
+    import plotly.express as px
     all_versions = get_all_versions_in_project(project_data)
 
-    
-    
     # Extract models and their commit counts
-    model_counts = pd.DataFrame([
-        [m.name, len(client.version.get_versions(model_id=m.id, project_id=project_data.id, limit=120).items)]
-        for m in models
-    ], columns=["modelName", "totalCommits"])
-
-    # Define function to categorize models
-    def categorize_model(name):
-        if name.startswith("residential"):
-            return "Residential"
-        elif name.startswith("facade"):
-            return "Facade"
-        elif name.startswith("structure"):
-            return "Structure"
-        elif name.startswith("service"):
-            return "Service"
-        elif name.startswith("industrial"):
-            return "Industrial"
-        else:
-            return "Other"
+    model_counts = count_model_commits(project_data, all_versions)
 
-    # Apply categorization
-    model_counts["category"] = model_counts["modelName"].apply(categorize_model)
+    # Categorize models by team, teams without a chart colour are grouped as Other
+    chart_teams = ["Residential", "Facade", "Structure", "Service", "Industrial"]
+    teams = [team_for_model(name) for name in model_counts["modelName"]]
+    model_counts["category"] = [team if team in chart_teams else "Other" for team in teams]
 
     # Create bar plot grouped by category
     model_graph = px.bar(
@@ -139,8 +112,7 @@ def create_graphs(project_data):
     )
     
     # Connector distribution
-    version_frame = pd.DataFrame.from_dict([{"sourceApplication": v.sourceApplication} for v in all_versions])
-    apps = version_frame["sourceApplication"].value_counts().reset_index()
+    apps = all_versions["sourceApplication"].value_counts().reset_index()
     apps.columns = ["app", "count"]
     connector_graph = px.pie(apps, names="app", values="count", hole=0.4, color_discrete_sequence=px.colors.sequential.Emrld)
     connector_graph.update_layout(
@@ -153,8 +125,7 @@ def create_graphs(project_data):
     connector_graph.update_traces(textposition='outside', sort = False, pull=[0.1] * len(apps))  # Display values outside bars
     
     # Contributor distribution
-    version_user_names = [v.authorUser.name for v in all_versions]
-    authors = pd.DataFrame(version_user_names).value_counts().reset_index()
+    authors = all_versions["author"].value_counts().reset_index()
     authors.columns = ["author", "count"]
     contributor_graph = px.pie(authors, names="author", values="count", hole=0.4, color_discrete_sequence=px.colors.sequential.Sunsetdark)
     contributor_graph.update_layout(
@@ -169,8 +140,7 @@ def create_graphs(project_data):
 
 def create_timeline(project_data):
     all_versions = get_all_versions_in_project(project_data)
-    timestamps = [version.createdAt.date() for version in all_versions]
-    timestamps_frame = pd.DataFrame(timestamps, columns=["createdAt"]).value_counts().reset_index()
+    timestamps_frame = all_versions["createdAt"].dt.date.value_counts().reset_index()
     timestamps_frame.columns = ["date", "count"]
     timestamps_frame["date"] = pd.to_datetime(timestamps_frame["date"])
     # timeline = px.line(timestamps_frame.sort_values("date"), x="date", y="count", title="Commit Activity Timeline", markers=True)
@@ -182,55 +152,21 @@ EMBED_URL = f"https://docs.google.com/spreadsheets/d/{SHEET_ID_01}/htmlembed"
 
 # Requirements sheet
 sheet_csv_urls = {
-    "Residential Team": "https://docs.google.com/spreadsheets/d/1yZRMx0Reso1ye_OGvZoSC9BE_jwYAZAtmm9w8U0fqUs/export?format=csv",
-    "Service Team": "https://docs.google.com/spreadsheets/d/1u6Sm7_eCTxN5gY4GMqggZG4zdgEhLy67BjkcpkVXg3A/export?format=csv",
-    "Facade Team": "https://docs.google.com/spreadsheets/d/1TbWJKI39oWrXVW4r8LoieRx9nuRdEQvuUVe-rXqotrc/export?format=csv",
-    "Structural Team": "https://docs.google.com/spreadsheets/d/1uIBeQa6y3gfS6D8nsHesmj9GVSo7UBWNGTdi6NM4oak/export?format=csv",
-    "Industrial Team": "https://docs.google.com/spreadsheets/d/1dxIEr_TIosqf5fb8_GNUxXZuG6WDWhnEfhcFtiDnY_I/export?format=csv",
+    "Residential Team": REQUIREMENTS["Residential"],
+    "Service Team": REQUIREMENTS["Service"],
+    "Facade Team": REQUIREMENTS["Facade"],
+    "Structural Team": REQUIREMENTS["Structure"],
+    "Industrial Team": REQUIREMENTS["Industrial"],
 }
 
 def load_sheet(team):
     if team in sheet_csv_urls:
-        df = pd.read_csv(sheet_csv_urls[team])
+        df = read_sheet(sheet_csv_urls[team], background_refresh=True)
         return df
 
-# Data for the first pie chart
-data_podium = pd.DataFrame({
-    "Category": ["Transport & Logistics", "Food Production", "Energy Production", "Parking & Service Areas"],
-    "Values": [55712, 24373, 24373, 20891],
-    "Sub-Category": ["Service", "Industrial", "Industrial", "Service"],
-})
-
-# Data for the second pie chart
-b1 = pd.DataFrame({
-    "Category": ["Studio", "1-Bedroom", "Circulation", "Amenities", "Retail", "Green Spaces"],
-    "Values": [72892.94, 90356.87, 127061.15, 121488.23, 60744.12, 18982.54],
-    "Sub-Category": ["Residential", "Residential","Residential", "Services", "Services", "Services"],
-})
-
-b2 = pd.DataFrame({
-    "Category": ["1-Bedroom", "2-Bedroom", "3-Bedroom", "Circulation",
-                 "4-Bedroom","Amenities", "Green Spaces", "Retail"],
-    "Values": [90356.87, 82763.86, 48595.29, 64540.62, 121488.23, 60744.12, 127061.15, 18982.54],
-    "Sub-Category": ["Residential", "Residential", "Residential", "Residential",
-                 "Residential","Services", "Services", "Services"],
-})
-
-b3 = pd.DataFrame({
-    "Category": ["2-Bedroom", "3-Bedroom", 
-                 "4-Bedroom","Penthouse", "Circulation", "Amenities", "Green Spaces",  "Retail"],
-    "Values": [82763.86, 48595.29, 64540.62, 17463.93, 121488.23, 60744.12, 127061.15, 18982.54],
-    "Sub-Category": ["Residential", "Residential", 
-                 "Residential","Residential", "Residential", "Services", "Services", "Services"],
-})
-
-b4 = pd.DataFrame({
-    "Category": ["Olympic Gymnasium", "Co-Working Space", 
-                 "Circulation","Retail", "Education", "Hospital & Wellness", "Commercial & Mixed-Use"],
-    "Values": [37965.07, 22779.04, 127061.15, 18982.54, 212614, 9111.62, 7593.01],
-    "Sub-Category": ["Services", "Services", 
-                 "Services","Services", "Services", "Services", "Services"]
-})
+# Program areas of the podium and the four towers (see kpis)
+data_podium = PODIUM_PROGRAM
+b1, b2, b3, b4 = TOWER_PROGRAMS
 
 df_all = pd.DataFrame({
     "Category": ["Podium", "Tower 1", "Tower 2", "Tower 3", 
@@ -239,6 +175,7 @@ df_all = pd.DataFrame({
 })
 
 def create_piechart(values, names, categories):
+    import plotly.express as px
     # Define color palettes
     color_palettes = {
         'Residential': px.colors.sequential.Emrld[1:],  
@@ -283,15 +220,18 @@ def create_piechart(values, names, categories):
 
 
 # Create the pie charts
-fig = px.pie(data_podium, names="Category", values="Values", hole=0.4, color_discrete_sequence=px.colors.sequential.Emrld)
-fig.update_layout(height = 500,legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5, font=dict(color="white")),
-        paper_bgcolor='rgb(15, 15, 15)',  # Graphite background
-        plot_bgcolor='rgb(15, 15, 15)',   # Graphite plot area
-        font=dict(color='white'),         # White font color
-        title_font=dict(color='white'),   # White title font
-        yaxis=dict(showticklabels=False), # Hide y-axis labels
-        xaxis=dict(showgrid=True, gridcolor='rgb(115, 115, 115)'))
-fig.update_traces(textposition='outside', sort = False, pull=[0.1] * len(data_podium))  # Display values outside bars
+def podium_piechart():
+    import plotly.express as px
+    fig = px.pie(data_podium, names="Category", values="Values", hole=0.4, color_discrete_sequence=px.colors.sequential.Emrld)
+    fig.update_layout(height = 500,legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5, font=dict(color="white")),
+            paper_bgcolor='rgb(15, 15, 15)',  # Graphite background
+            plot_bgcolor='rgb(15, 15, 15)',   # Graphite plot area
+            font=dict(color='white'),         # White font color
+            title_font=dict(color='white'),   # White title font
+            yaxis=dict(showticklabels=False), # Hide y-axis labels
+            xaxis=dict(showgrid=True, gridcolor='rgb(115, 115, 115)'))
+    fig.update_traces(textposition='outside', sort = False, pull=[0.1] * len(data_podium))  # Display values outside bars
+    return fig
 
 # fig1 = px.pie(b1, names="Category", values="Values", hole=0.4, color_discrete_sequence=px.colors.sequential.Sunsetdark)
 # fig1.update_layout(height = 500,legend=dict(orientation="h", yanchor="bottom", y=-0.4, xanchor="center", x=0.5, font=dict(family="Roboto Mono", size=12, color="white")),
@@ -333,60 +273,78 @@ fig.update_traces(textposition='outside', sort = False, pull=[0.1] * len(data_po
 #         xaxis=dict(showgrid=True, gridcolor='rgb(115, 115, 115)'))
 # fig4.update_traces(textposition='outside', sort = False, pull=[0.1] * len(b4))  # Display values outside bars
 
-fig5 = px.pie(df_all, names="Category", values="Values", hole=0.4, color_discrete_sequence=px.colors.sequential.Agsunset_r)
-fig5.update_layout(height = 500, legend=dict(orientation="h", yanchor="bottom", y=-0.3, xanchor="center", x=0.5, font=dict(color="white")),
-        paper_bgcolor='rgb(15, 15, 15)',  # Graphite background
-        plot_bgcolor='rgb(15, 15, 15)',   # Graphite plot area
-        font=dict(color='white'),         # White font color
-        title_font=dict(color='white'),   # White title font
-        yaxis=dict(showticklabels=False), # Hide y-axis labels
-        xaxis=dict(showgrid=True, gridcolor='rgb(115, 115, 115)'))
-fig5.update_traces(textposition='outside', sort = False, pull=[0.1] * len(df_all))  # Display values outside bars
-
-fig1 = create_piechart(b1['Values'], b1['Category'], b1['Sub-Category'])
-fig2 = create_piechart(b2['Values'], b2['Category'], b2['Sub-Category'])
-fig3 = create_piechart(b3['Values'], b3['Category'], b3['Sub-Category'])
-fig4 = create_piechart(b4['Values'], b4['Category'], b4['Sub-Category'])
-# fig = create_piechart(data_podium['Values'], data_podium['Category'], data_podium['Sub-Category'])
-
-# Create Gradio interface
-with gr.Blocks(title="Speckle Stream Activity Dashboard") as p_demo:
-        gr.Markdown("#", height=15)
-        # gr.Markdown("## Program Distribution 🏢")
-        with gr.Row():
-                gr.Image(value="hyperB.png", show_label=False, container=False, show_fullscreen_button=False, show_download_button=False, height=800)
-        # with gr.Row():
-        #             gr.Image(value="images/hyperB_02.jpg", show_label=False, container=False, show_fullscreen_button=False, show_download_button=False, height=400)
-        #             gr.Image(value="images/hyperB_03.jpg", show_label=False, container=False, show_fullscreen_button=False, show_download_button=False, height=400)
-        #             gr.Image(value="images/hyperB_04.jpg", show_label=False, container=False, show_fullscreen_button=False, show_download_button=False, height=400)
-        # # gr.HTML(f'<iframe src="{EMBED_URL}" width="120%" height="500px"></iframe>')
-        # # program_charts = create_program_charts()
-        gr.Markdown("#", height=50)
-        with gr.Row():
-            with gr.Column():
-                gr.Markdown("### All Towers", container=True) 
-                gr.Plot(fig5, container=False, show_label=False)
-            with gr.Column():
-                gr.Markdown("### Podium - Transport & Industry", container=True) 
-                gr.Plot(fig, container=False, show_label=False)
-        gr.Markdown("#", height=15)
-        with gr.Row():
+def towers_piechart():
+    import plotly.express as px
+    fig5 = px.pie(df_all, names="Category", values="Values", hole=0.4, color_discrete_sequence=px.colors.sequential.Agsunset_r)
+    fig5.update_layout(height = 500, legend=dict(orientation="h", yanchor="bottom", y=-0.3, xanchor="center", x=0.5, font=dict(color="white")),
+            paper_bgcolor='rgb(15, 15, 15)',  # Graphite background
+            plot_bgcolor='rgb(15, 15, 15)',   # Graphite plot area
+            font=dict(color='white'),         # White font color
+            title_font=dict(color='white'),   # White title font
+            yaxis=dict(showticklabels=False), # Hide y-axis labels
+            xaxis=dict(showgrid=True, gridcolor='rgb(115, 115, 115)'))
+    fig5.update_traces(textposition='outside', sort = False, pull=[0.1] * len(df_all))  # Display values outside bars
+    return fig5
+
+# Every chart of the page, built the first time the Program Overview tab is selected
+def load_data():
+    fig5 = cached_figure("program/towers", towers_piechart)
+    fig = cached_figure("program/podium", podium_piechart)
+    fig1 = cached_figure("program/fig1", lambda: create_piechart(b1['Values'], b1['Category'], b1['Sub-Category']))
+    fig2 = cached_figure("program/fig2", lambda: create_piechart(b2['Values'], b2['Category'], b2['Sub-Category']))
+    fig3 = cached_figure("program/fig3", lambda: create_piechart(b3['Values'], b3['Category'], b3['Sub-Category']))
+    fig4 = cached_figure("program/fig4", lambda: create_piechart(b4['Values'], b4['Category'], b4['Sub-Category']))
+    # fig = create_piechart(data_podium['Values'], data_podium['Category'], data_podium['Sub-Category'])
+    return {"figures": (fig5, fig, fig1, fig2, fig3, fig4)}
+
+page = LazyPage("program", load_data)
+
+# Gradio interface, built by app.py so the statistics and figures import without the UI
+def build_demo():
+    import gradio as gr
+
+    with gr.Blocks(title="Speckle Stream Activity Dashboard") as p_demo:
+            gr.Markdown("#", height=15)
+            # gr.Markdown("## Program Distribution 🏢")
+            with gr.Row():
+                    gr.Image(value="hyperB.png", show_label=False, container=False, show_fullscreen_button=False, show_download_button=False, height=800)
+            # with gr.Row():
+            #             gr.Image(value="images/hyperB_02.jpg", show_label=False, container=False, show_fullscreen_button=False, show_download_button=False, height=400)
+            #             gr.Image(value="images/hyperB_03.jpg", show_label=False, container=False, show_fullscreen_button=False, show_download_button=False, height=400)
+            #             gr.Image(value="images/hyperB_04.jpg", show_label=False, container=False, show_fullscreen_button=False, show_download_button=False, height=400)
+            # # gr.HTML(f'<iframe src="{EMBED_URL}" width="120%" height="500px"></iframe>')
+            # # program_charts = create_program_charts()
+            gr.Markdown("#", height=50)
+            with gr.Row():
+                with gr.Column():
+                    gr.Markdown("### All Towers", container=True) 
+                    plot5 = gr.Plot(container=False, show_label=False)
+                with gr.Column():
+                    gr.Markdown("### Podium - Transport & Industry", container=True) 
+                    plot = gr.Plot(container=False, show_label=False)
+            gr.Markdown("#", height=15)
+            with gr.Row():
             
-            with gr.Column():
-                gr.Markdown("### Tower A - Mixed,  GFA - 110k m² ", container=True) 
-                gr.Plot(fig1, container=False, show_label=False)
-            with gr.Column():
-                gr.Markdown("### Tower B - Mixed,  GFA - 120k m² ", container=True) 
-                gr.Plot(fig2, container=False, show_label=False)
-        gr.Markdown("#", height=15)   
-        with gr.Row():
+                with gr.Column():
+                    gr.Markdown("### Tower A - Mixed,  GFA - 110k m² ", container=True) 
+                    plot1 = gr.Plot(container=False, show_label=False)
+                with gr.Column():
+                    gr.Markdown("### Tower B - Mixed,  GFA - 120k m² ", container=True) 
+                    plot2 = gr.Plot(container=False, show_label=False)
+            gr.Markdown("#", height=15)   
+            with gr.Row():
                 
-            with gr.Column():
-                gr.Markdown("### Tower C - Mixed,  GFA - 115k m² ", container=True) 
-                gr.Plot(fig3, container=False, show_label=False)
-            with gr.Column():
-                gr.Markdown("### Tower D - Service,  GFA - 95k m² ", container=True) 
-                gr.Plot(fig4, container=False, show_label=False)
+                with gr.Column():
+                    gr.Markdown("### Tower C - Mixed,  GFA - 115k m² ", container=True) 
+                    plot3 = gr.Plot(container=False, show_label=False)
+                with gr.Column():
+                    gr.Markdown("### Tower D - Service,  GFA - 95k m² ", container=True) 
+                    plot4 = gr.Plot(container=False, show_label=False)
+
+            # Filled when the tab is first selected (see app.py)
+            page.bind([plot5, plot, plot1, plot2, plot3, plot4], lambda page_data: list(page_data["figures"]))
+
+    return p_demo
             
 
     # with gr.Tab("Speckle Insights"):
@@ -0,0 +1,175 @@
+import logging
+import os
+import threading
+import time
+
+from speckle_async import run_concurrently
+from offline_bundle import is_offline, load_bundle, bundle_project
+from rate_limit import BACKGROUND, PRIORITY_NAMES, priority
+from speckle_session import project_id, models_limit, get_client, call_client, speckle_limiter
+from speckle_versions import iter_models_with_versions, version_rows, to_version_table
+from single_flight import SingleFlight
+from startup_profile import phase
+from team_taxonomy import TeamTaxonomy
+from version_store import get_version_table
+
+# Stale-while-revalidate snapshot of the HyperB project.
+# UI handlers always read the current snapshot without any network I/O, while a
+# background thread replaces it with a fresh one every `refresh_interval` seconds
+# and syncs the version store behind the shared version table. Every refresh also logs
+# the counters of the Speckle rate limiter.
+
+logger = logging.getLogger(__name__)
+
+refresh_interval = float(os.environ.get("HYPERB_REFRESH_SECONDS", 300))
+
+_lock = threading.Lock()
+_snapshot = None
+_refresher = None
+_flights = SingleFlight()
+
+
+class ProjectSnapshot:
+    """Project with its model list and the latest version of every model at one point in time."""
+
+    def __init__(self, project, latest_versions):
+        self.project = project
+        self.latest_versions = latest_versions
+        self.fetched_at = time.time()
+        # Lookup indexes so a model switch needs neither a scan nor a Speckle round trip
+        self.models_by_name = {m.name: m for m in project.models.items}
+        self.latest_by_model_id = {row["model_id"]: row for row in latest_versions.to_dict("records")}
+        self.taxonomy = TeamTaxonomy(self.models_by_name)
+        # Equal for snapshots with the same models and latest versions, whenever they were fetched
+        self.signature = (tuple(sorted((m.id, m.name) for m in project.models.items)),
+                          tuple(sorted(row["id"] for row in self.latest_by_model_id.values())))
+
+
+def fetch_project():
+    """Fetch the project with all of its models, following the model cursor page by page."""
+    client = get_client()
+    with phase("speckle", "get_with_models"):
+        project = call_client(client.project.get_with_models, project_id=project_id, models_limit=models_limit)
+    items = list(project.models.items)
+    cursor = project.models.cursor
+    while cursor and len(items) < project.models.totalCount:
+        with phase("speckle", "get_with_models"):
+            page = call_client(client.project.get_with_models, project_id=project_id, models_limit=models_limit,
+                               models_cursor=cursor).models
+        if not page.items:
+            break
+        items.extend(page.items)
+        cursor = page.cursor
+    project.models.items = items
+    return project
+
+
+def fetch_latest_versions():
+    """Fetch the latest version of every model as a version table."""
+    rows = []
+    for model in iter_models_with_versions(limit=1):
+        rows.extend(version_rows(model, model["versions"]["items"]))
+    return to_version_table(rows)
+
+
+def fetch_snapshot():
+    """Fetch the project and the latest version of every model from Speckle (or the offline bundle)."""
+    if is_offline():
+        return ProjectSnapshot(bundle_project(), to_version_table(load_bundle()["latest_versions"]))
+    # The model list and the latest versions are independent queries, run them side by side
+    project, latest_versions = run_concurrently([(fetch_project, ()), (fetch_latest_versions, ())])
+    return ProjectSnapshot(project, latest_versions)
+
+
+def get_snapshot():
+    """Return the current snapshot, fetching it synchronously only the very first time."""
+    global _snapshot
+    if _snapshot is None:
+        with _lock:
+            if _snapshot is None:
+                _snapshot = fetch_snapshot()
+    return _snapshot
+
+
+def refresh_snapshot():
+    """Replace the current snapshot with a fresh one, keeping the old one on failure."""
+    global _snapshot
+    try:
+        snapshot = _flights.do("snapshot", fetch_snapshot)
+    except Exception:
+        logger.exception("Speckle snapshot refresh failed, serving the previous snapshot")
+        return _snapshot
+    _snapshot = snapshot
+    return snapshot
+
+
+def refresh_versions():
+    """Sync the version store into the shared version table, keeping the old table on failure."""
+    try:
+        return get_version_table(refresh=True)
+    except Exception:
+        logger.exception("Version store sync failed, serving the previous version table")
+        return None
+
+
+def log_rate_limit():
+    """Log the calls granted, queued and rejected by the Speckle rate limiter since startup."""
+    metrics = speckle_limiter.metrics()
+    per_priority = []
+    for name in PRIORITY_NAMES.values():
+        stats = metrics[name]
+        per_priority.append(f"{name} {stats['granted']} granted, {stats['queued']} queued, "
+                            f"{stats['rejected']} rejected, {stats['wait_seconds']:.1f}s waited")
+    logger.info("Speckle rate limiter: %s; %d waiting, %.2f tokens left",
+                "; ".join(per_priority), metrics["waiting"], metrics["tokens"])
+
+
+def _refresh_loop(interval):
+    while True:
+        time.sleep(interval)
+        # Refreshes yield to interactive handlers in the Speckle rate limiter
+        # Versions first: pages reload on the new snapshot and then read the new versions too
+        with priority(BACKGROUND):
+            refresh_versions()
+            refresh_snapshot()
+        log_rate_limit()
+
+
+def start_refresher(interval=None):
+    """Start the background refresher thread once per process (never in offline mode)."""
+    global _refresher
+    if is_offline():
+        return None
+    with _lock:
+        if _refresher is None:
+            _refresher = threading.Thread(target=_refresh_loop, args=(interval or refresh_interval,),
+                                          name="speckle-snapshot-refresher", daemon=True)
+            _refresher.start()
+    return _refresher
+
+
+def find_model(model_name):
+    """Return the model with the given name from the current snapshot, or None."""
+    return get_snapshot().models_by_name.get(model_name)
+
+
+def models_with_prefix(prefix):
+    """Return the models of the current snapshot whose name starts with prefix."""
+    snapshot = get_snapshot()
+    return [snapshot.models_by_name[name] for name in snapshot.taxonomy.models_with_prefix(prefix)]
+
+
+def models_for_team(team):
+    """Return the models a team shares on the dashboard, from the current snapshot."""
+    snapshot = get_snapshot()
+    return [snapshot.models_by_name[name] for name in snapshot.taxonomy.models_for_team(team)]
+
+
+def team_for_model(model_name):
+    """Return the team owning a model in the current snapshot."""
+    return get_snapshot().taxonomy.team_for_model(model_name)
+
+
+def latest_version(model_id):
+    """Return the latest version row of a model from the current snapshot, or None."""
+    return get_snapshot().latest_by_model_id.get(model_id)
@@ -0,0 +1,125 @@
+import contextlib
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+
+# Process-wide token-bucket rate limiting with priority classes.
+# Callers waiting for a token are served highest priority first, so interactive UI
+# handlers are never stuck behind a queue of background refreshes.
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+_current_priority = contextvars.ContextVar("rate_limit_priority", default=INTERACTIVE)
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a call could not get a token in time or the queue is full."""
+
+
+@contextlib.contextmanager
+def priority(level):
+    """Run the calls made inside the block (and the workers they start) at the given priority."""
+    token = _current_priority.set(level)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority():
+    return _current_priority.get()
+
+
+class TokenBucketLimiter:
+    """Token bucket refilled at `rate` tokens per second, holding at most `burst` tokens.
+
+    Args:
+        rate (float): Sustained number of calls per second.
+        burst (int): Number of calls allowed back to back.
+        max_queue (int): Callers allowed to wait at once, further callers are rejected.
+        max_wait (dict): Seconds a caller of each priority may wait before being rejected,
+            None to wait indefinitely.
+    """
+
+    def __init__(self, rate, burst, max_queue=100, max_wait=None):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.max_queue = max_queue
+        self.max_wait = max_wait or {}
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._metrics = {name: {"granted": 0, "queued": 0, "rejected": 0, "wait_seconds": 0.0}
+                         for name in PRIORITY_NAMES.values()}
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, level=None):
+        """Take one token, waiting behind higher priority callers if needed.
+
+        Raises:
+            RateLimitExceeded: If the wait queue is full or the wait exceeds max_wait.
+        """
+        level = current_priority() if level is None else level
+        stats = self._metrics[PRIORITY_NAMES[level]]
+        max_wait = self.max_wait.get(level)
+        with self._condition:
+            self._refill()
+            if not self._waiters and self._tokens >= 1:
+                self._tokens -= 1
+                stats["granted"] += 1
+                return
+
+            if len(self._waiters) >= self.max_queue:
+                stats["rejected"] += 1
+                raise RateLimitExceeded("Speckle request queue is full")
+
+            entry = (level, next(self._sequence))
+            heapq.heappush(self._waiters, entry)
+            stats["queued"] += 1
+            started = time.monotonic()
+            deadline = None if max_wait is None else started + max_wait
+            try:
+                while True:
+                    self._refill()
+                    if self._waiters[0] == entry and self._tokens >= 1:
+                        heapq.heappop(self._waiters)
+                        self._tokens -= 1
+                        stats["granted"] += 1
+                        return
+                    timeout = max((1 - self._tokens) / self.rate, 0.001)
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._waiters.remove(entry)
+                            heapq.heapify(self._waiters)
+                            stats["rejected"] += 1
+                            raise RateLimitExceeded(f"Waited more than {max_wait}s for a Speckle request slot")
+                        timeout = min(timeout, remaining)
+                    self._condition.wait(timeout)
+            finally:
+                stats["wait_seconds"] += time.monotonic() - started
+                self._condition.notify_all()
+
+    def call(self, fn, *args, **kwargs):
+        """Acquire a token at the current priority, then call fn."""
+        self.acquire()
+        return fn(*args, **kwargs)
+
+    def metrics(self):
+        """Return granted, queued and rejected call counts per priority, plus the current queue length."""
+        with self._condition:
+            snapshot = {name: dict(stats) for name, stats in self._metrics.items()}
+            snapshot["waiting"] = len(self._waiters)
+            snapshot["tokens"] = round(self._tokens, 2)
+        return snapshot
@@ -1,45 +1,25 @@
 import gradio as gr
-from specklepy.api.client import SpeckleClient
-from specklepy.api.credentials import get_account_from_token
 import pandas as pd
-import plotly.express as px
-from config import speckle_token
-
-# Initialize Speckle client and credentials
-speckle_server = "macad.speckle.xyz"
-client = SpeckleClient(host=speckle_server)
-account = get_account_from_token(speckle_token, speckle_server)
-client.authenticate_with_account(account)
-
-# Project ID
-project_id = "28a211b286"
-project = client.project.get_with_models(project_id=project_id, models_limit=100)
-
-# Filter models whose names start with 'structure/'
-# models = [item for item in project.models.items]
-models = [item for item in project.models.items if item.name.startswith('residential/shared/')]
-model_unit = [item for item in project.models.items if item.name.startswith('data/visualization/residential-data-visualization')][0]
-model_views = [item for item in project.models.items if item.name.startswith('residential/shared/units_best_views')][0]
-model_solar = [item for item in project.models.items if item.name.startswith('residential/shared/units_sun_hours')][0]
-models_name = [m.name for m in models]  # Extract model names
-model_name = models_name[0]  # Select the first model
-
-versions = client.version.get_versions(model_id=model_unit.id, project_id=project.id, limit=100).items
-version_unit = versions[0]  # Select the first version
-version_views = client.version.get_versions(model_id=model_views.id, project_id=project_id, limit=100).items[0]
-version_solar = client.version.get_versions(model_id=model_solar.id, project_id=project.id, limit=100).items[0]
+from speckle_session import project_id
+from project_snapshot import find_model, latest_version, models_with_prefix
+from sheets import read_sheet, read_sheet_with_digest
+from offline_bundle import cached_figure
+from lazy_page import LazyPage
+from sheet_registry import RESIDENTIAL_UNITS, sheet_breakdown
+from kpis import RESIDENTIAL_VIEWS, RESIDENTIAL_DAYLIGHT
 
 def version_name(model, version):
     timestamp = model.createdAt.strftime("%Y-%m-%d %H:%M:%S")
-    return ' - '.join([version.authorUser.name, timestamp, version.message])
+    return ' - '.join([version["author"], timestamp, version["message"]])
 
 def create_viewer_url(model, version):
-    embed_src = f"https://macad.speckle.xyz/projects/{project_id}/models/{model.id}@{version.id}#embed=%7B%22isEnabled%22%3Atrue%2C%7D"
+    embed_src = f"https://macad.speckle.xyz/projects/{project_id}/models/{model.id}@{version['id']}#embed=%7B%22isEnabled%22%3Atrue%2C%7D"
     iframe = f'<iframe src="{embed_src}" style="width:100%; height:750px; border:none;"></iframe>'
     return iframe
 
 
 def plot_bar_chart(value1, value2, value3, value4):
+    import plotly.express as px
     df = pd.DataFrame({
         'type': [
             'Best views', 
@@ -69,6 +49,7 @@ def plot_bar_chart(value1, value2, value3, value4):
     return fig
 
 def plot_bar_chart2(value1, value2, value3, value4):
+    import plotly.express as px
     df = pd.DataFrame({
         'type': [
             'High daylight factor', 
@@ -98,6 +79,7 @@ def plot_bar_chart2(value1, value2, value3, value4):
     return fig
 
 def plot_pie_chart(types_list, values_list):
+    import plotly.express as px
     df = pd.DataFrame({
         'unit type': types_list,
         'values': values_list,
@@ -124,34 +106,53 @@ def plot_pie_chart(types_list, values_list):
 
 
 # Load Google Sheet
-sheet_csv_url = "https://docs.google.com/spreadsheets/d/1Ju7wDVKEIBMoE5DzkIIKqYtXg5rmnVC-52HSGhMYdew/export?format=csv&gid=2078375139"
+sheet_csv_url = RESIDENTIAL_UNITS
 
 # Function to fetch and update DataFrame
 def update_dataframe():
-    df = pd.read_csv(sheet_csv_url)
+    df = read_sheet(sheet_csv_url)
     return df
 
-df = update_dataframe()
-
-def highlight_last_row(s):
+def highlight_last_row(s, last_index):
     color = 'rgba(73, 191, 102, 0.15)'  # Light blue with 50% transparency
-    return [f'background-color: {color}' if s.name == df.index[-1] else '' for _ in s]
-
-# df = df.style.apply(highlight_last_row, axis=1) # Apply the highlighting
-
-# Function to update pie charts
-def update_pie_charts():
-    df = update_dataframe()
-    styler = df.style.apply(highlight_last_row, axis=1) # Apply the highlighting
-    pie1 = plot_pie_chart(df['TYPE'].tolist()[:-1], df['QUANTITY'].tolist()[:-1])
-    pie2 = plot_pie_chart(df['TYPE'].tolist()[:-1], df['AREA'].tolist()[:-1])
-    pie3 = plot_pie_chart(df['TYPE'].tolist()[:-1], df['POPULATION'].tolist()[:-1])
-    return styler, pie1, pie2, pie3
-
-df = update_pie_charts()[0]
-pie1 = update_pie_charts()[1]
-pie2 = update_pie_charts()[2]
-pie3 = update_pie_charts()[3]
+    return [f'background-color: {color}' if s.name == last_index else '' for _ in s]
+
+# Styled table and pie charts of the last sheet content, keyed by its content hash
+_pie_charts_cache = {}
+
+# Function to update pie charts, rebuilt only when the sheet content changed
+def update_pie_charts(ttl=None):
+    df, digest = read_sheet_with_digest(sheet_csv_url, ttl)
+    cached = _pie_charts_cache.get(digest)
+    if cached is None:
+        styler = df.style.apply(highlight_last_row, last_index=df.index[-1], axis=1) # Apply the highlighting
+        pie1 = cached_figure("residential/pie1", lambda: plot_pie_chart(*sheet_breakdown(df, sheet_csv_url, 'QUANTITY')))
+        pie2 = cached_figure("residential/pie2", lambda: plot_pie_chart(*sheet_breakdown(df, sheet_csv_url, 'AREA')))
+        pie3 = cached_figure("residential/pie3", lambda: plot_pie_chart(*sheet_breakdown(df, sheet_csv_url, 'POPULATION')))
+        cached = (styler, pie1, pie2, pie3)
+        _pie_charts_cache.clear()
+        _pie_charts_cache[digest] = cached
+    return cached
+
+# The update button always revalidates the sheet with Google instead of serving the cached copy
+def refresh_pie_charts():
+    return update_pie_charts(ttl=0)
+
+# Everything the page shows, loaded the first time the Residential tab is selected
+def load_data():
+    # Filter models whose names start with 'residential/shared/'
+    models = models_with_prefix('residential/shared/')
+    df, pie1, pie2, pie3 = update_pie_charts()
+    return {
+        "models_name": [m.name for m in models],  # Extract model names
+        "model_unit": models_with_prefix('data/visualization/residential-data-visualization')[0],
+        "model_views": models_with_prefix('residential/shared/units_best_views')[0],
+        "model_solar": models_with_prefix('residential/shared/units_sun_hours')[0],
+        "table": df,
+        "pies": (pie1, pie2, pie3),
+    }
+
+page = LazyPage("residential", load_data, sheets=[sheet_csv_url])
 # pie2.show()
 
 # More comprehensive CSS to remove all scrollbars
@@ -209,8 +210,8 @@ function refresh() {
 with gr.Blocks(css=custom_css, js=js_func, theme=gr.themes.Default(primary_hue="indigo", text_size="lg")) as r_demo:
 
     with gr.Row(equal_height=True):
-            model_dropdown = gr.Dropdown(choices=models_name, label="Select Residential Team Model")
-            version_text = gr.Textbox(value = version_name(model_unit, version_unit), info="Last Version of selected model", lines=2, container=False)
+            model_dropdown = gr.Dropdown(label="Select Residential Team Model")
+            version_text = gr.Textbox(info="Last Version of selected model", lines=2, container=False)
     with gr.Row(equal_height=True):
             viewer_iframe = gr.HTML()
             gr.Gallery(value=["residential_01.png", "residential_02.png", "residential_03.jpg"], label="Residential Team Images", 
@@ -219,7 +220,7 @@ with gr.Blocks(css=custom_css, js=js_func, theme=gr.themes.Default(primary_hue="
 
     gr.Markdown("#", height=50)
     gr.Markdown("## Data", container=True)            
-    data = gr.DataFrame(value=df, max_height=10000, label="Residential Team Metrics", interactive=False, show_fullscreen_button = True)
+    data = gr.DataFrame(max_height=10000, label="Residential Team Metrics", interactive=False, show_fullscreen_button = True)
 
     # Button to update the DataFrame manually
     update_button = gr.Button("Update Data & Pie Charts")
@@ -231,13 +232,13 @@ with gr.Blocks(css=custom_css, js=js_func, theme=gr.themes.Default(primary_hue="
     with gr.Row():
         with gr.Column():
             gr.Markdown("### Unit Type Distribution")
-            pie1 = gr.Plot(pie1, label="Unit Type Distribution", container=False)
+            pie1 = gr.Plot(label="Unit Type Distribution", container=False)
         with gr.Column():
             gr.Markdown("### Area Distribution")
-            pie2 = gr.Plot(pie2, label="Area Distribution", container=False)
+            pie2 = gr.Plot(label="Area Distribution", container=False)
         with gr.Column():
             gr.Markdown("### Population Distribution")
-            pie3 = gr.Plot(pie3, label="Population Distribution", container=False)
+            pie3 = gr.Plot(label="Population Distribution", container=False)
 
     with gr.Row():
         gr.Markdown("#", height=50)
@@ -253,10 +254,10 @@ with gr.Blocks(css=custom_css, js=js_func, theme=gr.themes.Default(primary_hue="
             
         with gr.Column():
             with gr.Column():
-                value1 = gr.Number(label="Best views (%)", value=6, show_label=True)
-                value2 = gr.Number(label="Premium views (%)", value=2.51, show_label=True)
-                value3 = gr.Number(label="Pleasant views (%)", value=43.02, show_label=True)
-                value4 = gr.Number(label="Average views (%)", value=48.46, show_label=True)
+                value1 = gr.Number(label="Best views (%)", value=RESIDENTIAL_VIEWS['best_views_pct'], show_label=True)
+                value2 = gr.Number(label="Premium views (%)", value=RESIDENTIAL_VIEWS['premium_views_pct'], show_label=True)
+                value3 = gr.Number(label="Pleasant views (%)", value=RESIDENTIAL_VIEWS['pleasant_views_pct'], show_label=True)
+                value4 = gr.Number(label="Average views (%)", value=RESIDENTIAL_VIEWS['average_views_pct'], show_label=True)
                 load_button1 = gr.Button("Load Views Bar Chart", variant="huggingface")
                 bar_plot1 = gr.Plot(container=False)
 
@@ -269,36 +270,42 @@ with gr.Blocks(css=custom_css, js=js_func, theme=gr.themes.Default(primary_hue="
                     show_fullscreen_button=False, show_download_button=False)
 
         with gr.Column():
-            value5 = gr.Number(label='High daylight factor: 6 hours of direct sunlight (%)', value=1.16, show_label=True)
-            value6 = gr.Number(label='Medium daylight factor: 4-5 hours of direct sunlight (%)', value=10.77, show_label=True)
-            value7 = gr.Number(label='Low daylight factor: 2-3 hours of direct sunlight (%)', value=44.22, show_label=True)
-            value8 = gr.Number(label="Low daylight factor: 0-1 hour of direct sunlight (%)", value=43.85, show_label=True)
+            value5 = gr.Number(label='High daylight factor: 6 hours of direct sunlight (%)', value=RESIDENTIAL_DAYLIGHT['high_daylight_pct'], show_label=True)
+            value6 = gr.Number(label='Medium daylight factor: 4-5 hours of direct sunlight (%)', value=RESIDENTIAL_DAYLIGHT['medium_daylight_pct'], show_label=True)
+            value7 = gr.Number(label='Low daylight factor: 2-3 hours of direct sunlight (%)', value=RESIDENTIAL_DAYLIGHT['low_daylight_pct'], show_label=True)
+            value8 = gr.Number(label="Low daylight factor: 0-1 hour of direct sunlight (%)", value=RESIDENTIAL_DAYLIGHT['extremely_low_daylight_pct'], show_label=True)
             load_button2 = gr.Button("Load Daylight Bar Chart", variant="huggingface")
             bar_plot2 = gr.Plot(container=False)
 
 
     # Load spekcle viewer
-    def initialize_app():
-        viewer_url = create_viewer_url(model_unit, version_unit)
-        viewer_url_views = create_viewer_url(model_views, version_views)
-        viewer_url_solar = create_viewer_url(model_solar, version_solar)
+    def initialize_app(page_data):
+        model_unit, model_views, model_solar = page_data["model_unit"], page_data["model_views"], page_data["model_solar"]
+        viewer_url = create_viewer_url(model_unit, latest_version(model_unit.id))
+        viewer_url_views = create_viewer_url(model_views, latest_version(model_views.id))
+        viewer_url_solar = create_viewer_url(model_solar, latest_version(model_solar.id))
         return viewer_url, viewer_url_views, viewer_url_solar
 
+    def fill_page(page_data):
+        model_unit = page_data["model_unit"]
+        return [gr.Dropdown(choices=page_data["models_name"]), version_name(model_unit, latest_version(model_unit.id)),
+                page_data["table"], *page_data["pies"], *initialize_app(page_data)]
 
 
-    r_demo.load(fn=initialize_app, outputs=[viewer_iframe, viewer_iframe_views, viewer_iframe_solar])
+    # Filled when the tab is first selected (see app.py)
+    page.bind([model_dropdown, version_text, data, pie1, pie2, pie3, viewer_iframe, viewer_iframe_views, viewer_iframe_solar], fill_page)
     
 
     #Button actions
-    update_button.click(fn=update_pie_charts, outputs=[data, pie1, pie2, pie3])
+    update_button.click(fn=refresh_pie_charts, outputs=[data, pie1, pie2, pie3])
     load_button1.click(plot_bar_chart, inputs=[value1, value2, value3, value4], outputs=bar_plot1)
     load_button2.click(plot_bar_chart2, inputs=[value5, value6, value7, value8], outputs=bar_plot2)
 
     def handle_model_change(selected_model_name):
-        selected_model = next((m for m in models if m.name == selected_model_name), None)
+        selected_model = find_model(selected_model_name)
         if not selected_model:
             return '<p>Model not found</p>'
-        version = client.version.get_versions(model_id=selected_model.id, project_id=project.id, limit=5).items[0]
+        version = latest_version(selected_model.id)
         return create_viewer_url(selected_model, version), version_name(selected_model, version)
 
 
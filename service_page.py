@@ -1,40 +1,25 @@
 import gradio as gr
-from specklepy.api.client import SpeckleClient
-from specklepy.api.credentials import get_account_from_token
 import pandas as pd
-import plotly.express as px
-from config import speckle_token
-
-# Initialize Speckle client and credentials
-speckle_server = "macad.speckle.xyz"
-client = SpeckleClient(host=speckle_server)
-account = get_account_from_token(speckle_token, speckle_server)
-client.authenticate_with_account(account)
-
-# Project ID
-project_id = "28a211b286"
-project = client.project.get_with_models(project_id=project_id, models_limit=100)
-
-# Filter models whose names start with 'structure/'
-# models = [item for item in project.models.items] // all models
-models = [item for item in project.models.items if item.name.startswith('service/')]
-model = models[0]  # Select the first model
-models_name = [m.name for m in models]  # Extract model names
-model_name = models_name[0]  # Select the first model
-versions = client.version.get_versions(model_id=model.id, project_id=project.id, limit=100).items
-version = versions[0]  # Select the first version
+from speckle_session import project_id
+from project_snapshot import find_model, latest_version, models_with_prefix
+from sheets import read_sheet
+from offline_bundle import cached_figure
+from lazy_page import LazyPage
+from sheet_registry import SERVICE_AREAS, SERVICE_AMENITIES, SERVICE_OPEN_SPACE, sheet_breakdown
+from kpis import SERVICE_METRICS
 
 def version_name(model, version):
     timestamp = model.createdAt.strftime("%Y-%m-%d %H:%M:%S")
-    return ' - '.join([version.authorUser.name, timestamp, version.message])
+    return ' - '.join([version["author"], timestamp, version["message"]])
 
 def create_viewer_url(model, version):
-    embed_src = f"https://macad.speckle.xyz/projects/{project_id}/models/{model.id}@{version.id}#embed=%7B%22isEnabled%22%3Atrue%2C%7D"
+    embed_src = f"https://macad.speckle.xyz/projects/{project_id}/models/{model.id}@{version['id']}#embed=%7B%22isEnabled%22%3Atrue%2C%7D"
     iframe = f'<iframe src="{embed_src}" style="width:100%; height:750px; border:none;"></iframe>'
     return iframe
 
 
 def plot_bar_chart(types_list, values_list):
+    import plotly.express as px
     df = pd.DataFrame({
         'amenity': types_list,
         'distance to amenities (minutes)': values_list,
@@ -62,6 +47,7 @@ def plot_bar_chart(types_list, values_list):
     return fig
 
 def plot_pie_chart(types_list, values_list, title):
+    import plotly.express as px
     df = pd.DataFrame({
         'category': types_list,
         'values': values_list,
@@ -96,29 +82,45 @@ def plot_pie_chart(types_list, values_list, title):
 
 ###########################################################################################################
 
-# Load Google Sheet
-sheet_csv_url1 = "https://docs.google.com/spreadsheets/d/1Ju7wDVKEIBMoE5DzkIIKqYtXg5rmnVC-52HSGhMYdew/export?format=csv&gid=156286963"
-df1 = pd.read_csv(sheet_csv_url1)
-
-sheet_csv_url2 = "https://docs.google.com/spreadsheets/d/1Ju7wDVKEIBMoE5DzkIIKqYtXg5rmnVC-52HSGhMYdew/export?format=csv&gid=1699500852"
-df2 = pd.read_csv(sheet_csv_url2)
-
-sheet_csv_url3 = "https://docs.google.com/spreadsheets/d/1Ju7wDVKEIBMoE5DzkIIKqYtXg5rmnVC-52HSGhMYdew/export?format=csv&gid=1882469927"
-df3 = pd.read_csv(sheet_csv_url3)
+# Google Sheets
+sheet_csv_url1 = SERVICE_AREAS
+sheet_csv_url2 = SERVICE_AMENITIES
+sheet_csv_url3 = SERVICE_OPEN_SPACE
 
 ###########################################################################################################
 
-pie1 = plot_pie_chart(df1['Function'].tolist()[:-2], df1['Area, sq.m.'].tolist()[:-2], 'Area Distribution (%)')
-bar2 = plot_bar_chart(df2['Amenity type'].tolist(), df2['time, min'].tolist())
-pie3 = plot_pie_chart(df3['Description'].tolist()[:-2], df3['Area, sq.m.'].tolist()[:-2], 'Open Area Distribution (%)')
-# pie1.show()
-
 def highlight_last_row(s):
     color = 'rgba(255, 136, 0, 0.15)'  # Light blue with 50% transparency
     return [f'background-color: {color}' if i == s.index[-1] else '' for i in s.index]
 
+# Everything the page shows, loaded the first time the Service tab is selected
+def load_data():
+    # Filter models whose names start with 'service/'
+    models = models_with_prefix('service/')
+    df1 = read_sheet(sheet_csv_url1)
+    df2 = read_sheet(sheet_csv_url2)
+    df3 = read_sheet(sheet_csv_url3)
+
+    pie1 = cached_figure("service/pie1", lambda: plot_pie_chart(*sheet_breakdown(df1, sheet_csv_url1, 'Area, sq.m.'), 'Area Distribution (%)'))
+    bar2 = cached_figure("service/bar2", lambda: plot_bar_chart(*sheet_breakdown(df2, sheet_csv_url2, 'time, min')))
+    pie3 = cached_figure("service/pie3", lambda: plot_pie_chart(*sheet_breakdown(df3, sheet_csv_url3, 'Area, sq.m.'), 'Open Area Distribution (%)'))
+    # pie1.show()
+
+    return {
+        "models_name": [m.name for m in models],  # Extract model names
+        "model": models[0],  # Select the first model
+        "tables": (
+            df1.style.apply(highlight_last_row, axis=0),  # Apply the highlighting
+            df2.style.apply(highlight_last_row, axis=1),
+            df3.style.apply(highlight_last_row, axis=0),
+        ),
+        "figures": (pie1, bar2, pie3),
+    }
+
+page = LazyPage("service", load_data, sheets=[sheet_csv_url1, sheet_csv_url2, sheet_csv_url3])
+
 # Metrics cards in a row with matching style to your dashboard
-metrics_html = """
+metrics_html = f"""
 <div style="padding: 20px; font-family: 'Roboto Mono', monospace;">
     <!-- Import Roboto Mono font -->
     <link href="https://fonts.googleapis.com/css2?family=Roboto+Mono:wght@400;500;700&display=swap" rel="stylesheet">
@@ -138,11 +140,11 @@ metrics_html = """
                         <path d="M12 4L12 20" stroke="#33ff33" stroke-width="2" stroke-linecap="round"/>
                         <path d="M6 10L12 4L18 10" stroke="#33ff33" stroke-width="2" stroke-linecap="round"/>
                     </svg>
-                    <span style="margin-left: 5px; font-size: 14px; color: #33ff33;">33%</span>
+                    <span style="margin-left: 5px; font-size: 14px; color: #33ff33;">{SERVICE_METRICS['open_area_per_person_increase_pct']}%</span>
                 </div>
             </div>
             <div style="color: #ffffff; font-size: 28px; font-weight: 700; letter-spacing: 0.5px; font-family: 'Roboto Mono', monospace;">
-                11.11 m²
+                {SERVICE_METRICS['open_area_per_person_m2']} m²
             </div>
         </div>
         
@@ -158,28 +160,24 @@ metrics_html = """
                         <path d="M12 20L12 4" stroke="#33ff33" stroke-width="2" stroke-linecap="round"/>
                         <path d="M6 14L12 20L18 14" stroke="#33ff33" stroke-width="2" stroke-linecap="round"/>
                     </svg>
-                    <span style="margin-left: 5px; font-size: 14px; color: #33ff33;">25%</span>
+                    <span style="margin-left: 5px; font-size: 14px; color: #33ff33;">{SERVICE_METRICS['average_amenity_travel_time_reduction_pct']}%</span>
                 </div>
             </div>
             <div style="color: #ffffff; font-size: 28px; font-weight: 700; letter-spacing: 0.5px; font-family: 'Roboto Mono', monospace;">
-                9min 45s
+                {SERVICE_METRICS['average_amenity_travel_time_s'] // 60}min {SERVICE_METRICS['average_amenity_travel_time_s'] % 60}s
             </div>
         </div>
     </div>
 </div>
 """
 
-df1 = df1.style.apply(highlight_last_row, axis=0) # Apply the highlighting
-df2 = df2.style.apply(highlight_last_row, axis=1)
-df3 = df3.style.apply(highlight_last_row, axis=0) # Apply the highlighting
-
-with gr.Blocks() as demo:
+with gr.Blocks() as s_demo:
 
     # with gr.Tab(label="Statictics"):
 
     with gr.Row(equal_height=True):
-            model_dropdown = gr.Dropdown(choices=models_name, label="Select Service Team Model", value = model_name)
-            version_text = gr.Textbox(value = version_name(model, version), info="Last version of selected model was sent by ", container=False, lines=2)
+            model_dropdown = gr.Dropdown(label="Select Service Team Model")
+            version_text = gr.Textbox(info="Last version of selected model was sent by ", container=False, lines=2)
     with gr.Row(equal_height=True):
         with gr.Column():
             viewer_iframe = gr.HTML()
@@ -195,24 +193,24 @@ with gr.Blocks() as demo:
     gr.Markdown("#", height=50)
     gr.Markdown("## Service Team Statistics", container=True)            
     with gr.Row():
-        gr.DataFrame(value=df1, label="Service Team Metrics", interactive=False, show_fullscreen_button = True, max_height=1000, column_widths=[200,100])
-        gr.Plot(pie1, container=False, show_label=False)
+        table1 = gr.DataFrame(label="Service Team Metrics", interactive=False, show_fullscreen_button = True, max_height=1000, column_widths=[200,100])
+        plot1 = gr.Plot(container=False, show_label=False)
 
     gr.Markdown("#", height=50)
     gr.Markdown("## KPI 1: Distance to amenities", container=True)  
     with gr.Row():
         with gr.Column(scale=1.1):
-            gr.DataFrame(value=df2, label="Distance to function", interactive=False, show_fullscreen_button = True, max_height=1000, show_row_numbers=True)
+            table2 = gr.DataFrame(label="Distance to function", interactive=False, show_fullscreen_button = True, max_height=1000, show_row_numbers=True)
         with gr.Column():
-            gr.Plot(bar2, container=False, show_label=False) 
+            plot2 = gr.Plot(container=False, show_label=False) 
 
     gr.Markdown("#", height=50)
     gr.Markdown("## KPI 2: Open Space per person", container=True)  
     with gr.Row():
         with gr.Column():
-            gr.DataFrame(value=df3, label="Open Space per person", interactive=False, show_fullscreen_button = True, max_height=1000)
+            table3 = gr.DataFrame(label="Open Space per person", interactive=False, show_fullscreen_button = True, max_height=1000)
         with gr.Column():
-            gr.Plot(pie3, container=False, show_label=False)  
+            plot3 = gr.Plot(container=False, show_label=False)  
 
     # with gr.Tab(label="Adjancency matrix"):
     #     gr.Markdown("#", height=50)
@@ -221,18 +219,24 @@ with gr.Blocks() as demo:
         
 
     # Load spekcle viewer
-    def initialize_app():
-        viewer_url = create_viewer_url(model, version)
+    def initialize_app(model):
+        viewer_url = create_viewer_url(model, latest_version(model.id))
         return viewer_url
 
+    def fill_page(page_data):
+        model = page_data["model"]
+        return [gr.Dropdown(choices=page_data["models_name"], value=model.name), version_name(model, latest_version(model.id)),
+                *page_data["tables"], *page_data["figures"], initialize_app(model)]
+
 
-    demo.load(fn=initialize_app, outputs=[viewer_iframe])
+    # Filled when the tab is first selected (see app.py)
+    page.bind([model_dropdown, version_text, table1, table2, table3, plot1, plot2, plot3, viewer_iframe], fill_page)
 
     def handle_model_change(selected_model_name):
-        selected_model = next((m for m in models if m.name == selected_model_name), None)
+        selected_model = find_model(selected_model_name)
         if not selected_model:
             return '<p>Model not found</p>'
-        version = client.version.get_versions(model_id=selected_model.id, project_id=project.id, limit=5).items[0]
+        version = latest_version(selected_model.id)
         return create_viewer_url(selected_model, version), version_name(selected_model, version)
 
 
@@ -240,7 +244,7 @@ with gr.Blocks() as demo:
     model_dropdown.change(fn=handle_model_change, inputs=model_dropdown, outputs=[viewer_iframe, version_text])
 
     
-demo.launch()
+# s_demo.launch()
 
 # gradio service_page.py
 
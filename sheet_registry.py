@@ -0,0 +1,56 @@
+from sheets import register_sheet
+
+# Every Google Sheet the dashboard pages read.
+# Registering them in one place lets app.py prefetch all of them concurrently before
+# the page modules import. The layout of the team sheets is described here too, so the
+# pages and the KPI report read the same rows out of them.
+
+SPREADSHEET_URL = "https://docs.google.com/spreadsheets/d/1Ju7wDVKEIBMoE5DzkIIKqYtXg5rmnVC-52HSGhMYdew/export?format=csv&gid="
+
+RESIDENTIAL_UNITS = register_sheet("residential/units", SPREADSHEET_URL + "2078375139")
+SERVICE_AREAS = register_sheet("service/areas", SPREADSHEET_URL + "156286963")
+SERVICE_AMENITIES = register_sheet("service/amenities", SPREADSHEET_URL + "1699500852")
+SERVICE_OPEN_SPACE = register_sheet("service/open_space", SPREADSHEET_URL + "1882469927")
+FACADE_TYPES = register_sheet("facade/types", SPREADSHEET_URL + "451167349")
+STRUCTURE_WIND_LOADS = register_sheet("structure/wind_loads", SPREADSHEET_URL + "1574003666")
+
+# Column naming the rows of each team sheet
+LABEL_COLUMNS = {
+    RESIDENTIAL_UNITS: "TYPE",
+    SERVICE_AREAS: "Function",
+    SERVICE_AMENITIES: "Amenity type",
+    SERVICE_OPEN_SPACE: "Description",
+    FACADE_TYPES: "NAME",
+    STRUCTURE_WIND_LOADS: "Tower number",
+}
+
+# Totals rows closing a sheet, shown in the page tables but left out of charts and KPIs
+TOTAL_ROWS = {
+    RESIDENTIAL_UNITS: 1,
+    SERVICE_AREAS: 2,
+    SERVICE_OPEN_SPACE: 2,
+    FACADE_TYPES: 1,
+}
+
+
+def sheet_rows(df, url):
+    """Rows of a team sheet without the totals rows that close it."""
+    return df.iloc[:len(df) - TOTAL_ROWS.get(url, 0)]
+
+
+def sheet_breakdown(df, url, column):
+    """Labels and values of one column of a team sheet, totals rows left out."""
+    rows = sheet_rows(df, url)
+    return rows[LABEL_COLUMNS[url]].tolist(), rows[column].tolist()
+
+# Team requirement sheets rarely change, keep them for an hour
+REQUIREMENTS = {
+    team: register_sheet(f"requirements/{team}", url, ttl=3600)
+    for team, url in {
+        "Residential": "https://docs.google.com/spreadsheets/d/1yZRMx0Reso1ye_OGvZoSC9BE_jwYAZAtmm9w8U0fqUs/export?format=csv",
+        "Service": "https://docs.google.com/spreadsheets/d/1u6Sm7_eCTxN5gY4GMqggZG4zdgEhLy67BjkcpkVXg3A/export?format=csv",
+        "Facade": "https://docs.google.com/spreadsheets/d/1TbWJKI39oWrXVW4r8LoieRx9nuRdEQvuUVe-rXqotrc/export?format=csv",
+        "Structure": "https://docs.google.com/spreadsheets/d/1uIBeQa6y3gfS6D8nsHesmj9GVSo7UBWNGTdi6NM4oak/export?format=csv",
+        "Industrial": "https://docs.google.com/spreadsheets/d/1dxIEr_TIosqf5fb8_GNUxXZuG6WDWhnEfhcFtiDnY_I/export?format=csv",
+    }.items()
+}
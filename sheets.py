@@ -0,0 +1,254 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from offline_bundle import is_offline, bundle_sheet
+from single_flight import SingleFlight
+from startup_profile import phase
+
+# Google Sheets CSV exports used by the dashboard pages.
+# Every sheet is cached in memory and on disk with a time-to-live. Expired copies are
+# revalidated with a conditional request (ETag / Last-Modified), and when Google is slow
+# or unreachable the last good copy on disk is served instead.
+# Concurrent reads of the same sheet share a single download.
+# In offline mode every sheet comes from the snapshot bundle.
+
+logger = logging.getLogger(__name__)
+
+cache_dir = os.environ.get("HYPERB_SHEET_CACHE", os.path.join(".cache", "sheets"))
+default_ttl = float(os.environ.get("HYPERB_SHEET_TTL", 600))
+request_timeout = float(os.environ.get("HYPERB_SHEET_TIMEOUT", 10))
+# Seconds to keep serving a stale copy before trying Google again after a failed refresh
+retry_interval = 60
+
+# Per-sheet time-to-live in seconds, sheets not listed use default_ttl
+sheet_ttls = {}
+# Every sheet the dashboard reads, by name (see sheet_registry)
+registered_sheets = {}
+
+_flights = SingleFlight()
+_lock = threading.Lock()
+_memory = {}
+_next_retry = {}
+_refreshing = set()
+_background = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sheet-refresh")
+
+
+class _CachedSheet:
+    __slots__ = ("df", "digest", "etag", "last_modified", "fetched_at")
+
+    def __init__(self, df, digest, etag=None, last_modified=None, fetched_at=None):
+        self.df = df
+        self.digest = digest
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at or time.time()
+
+
+def _cache_paths(url):
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{key}.csv"), os.path.join(cache_dir, f"{key}.json")
+
+
+def _parse(content):
+    return pd.read_csv(io.BytesIO(content))
+
+
+def _load_from_disk(url):
+    data_path, meta_path = _cache_paths(url)
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(data_path, "rb") as f:
+            df = _parse(f.read())
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.warning("Ignoring unreadable cached copy of sheet %s", url, exc_info=True)
+        return None
+    return _CachedSheet(df, meta.get("digest"), meta.get("etag"), meta.get("last_modified"), meta.get("fetched_at"))
+
+
+def _save_to_disk(url, content, sheet):
+    data_path, meta_path = _cache_paths(url)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(data_path, "wb") as f:
+        f.write(content)
+    _save_meta(url, sheet, meta_path)
+
+
+def _save_meta(url, sheet, meta_path=None):
+    meta_path = meta_path or _cache_paths(url)[1]
+    os.makedirs(cache_dir, exist_ok=True)
+    meta = {"url": url, "digest": sheet.digest, "etag": sheet.etag,
+            "last_modified": sheet.last_modified, "fetched_at": sheet.fetched_at}
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def _download(url, cached):
+    """Fetch a sheet from Google, revalidating the cached copy when there is one."""
+    request = urllib.request.Request(url)
+    if cached is not None and cached.etag:
+        request.add_header("If-None-Match", cached.etag)
+    if cached is not None and cached.last_modified:
+        request.add_header("If-Modified-Since", cached.last_modified)
+    name = next((name for name, registered in registered_sheets.items() if registered == url), url)
+    try:
+        with phase("sheet", name), urllib.request.urlopen(request, timeout=request_timeout) as response:
+            content = response.read()
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+    except urllib.error.HTTPError as error:
+        if error.code == 304 and cached is not None:
+            cached.fetched_at = time.time()
+            _save_meta(url, cached)
+            return cached
+        raise
+
+    digest = hashlib.sha256(content).hexdigest()
+    if cached is not None and digest == cached.digest:
+        # Unchanged content without validators: keep the parsed frame
+        cached.etag, cached.last_modified, cached.fetched_at = etag, last_modified, time.time()
+        _save_meta(url, cached)
+        return cached
+    sheet = _CachedSheet(_parse(content), digest, etag, last_modified)
+    _save_to_disk(url, content, sheet)
+    return sheet
+
+
+def _refresh(url, cached):
+    try:
+        sheet = _download(url, cached)
+    except Exception:
+        if cached is None:
+            raise
+        logger.warning("Could not refresh sheet %s, serving the copy from %s", url,
+                       time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(cached.fetched_at)), exc_info=True)
+        with _lock:
+            _next_retry[url] = time.time() + retry_interval
+        return cached
+    with _lock:
+        _memory[url] = sheet
+        _next_retry.pop(url, None)
+    return sheet
+
+
+def _refresh_in_background(url, cached):
+    with _lock:
+        if url in _refreshing:
+            return
+        _refreshing.add(url)
+
+    def run():
+        try:
+            _flights.do(url, _refresh, url, cached)
+        except Exception:
+            logger.warning("Background refresh of sheet %s failed", url, exc_info=True)
+        finally:
+            with _lock:
+                _refreshing.discard(url)
+
+    _background.submit(run)
+
+
+def _get_offline_sheet(url):
+    with _lock:
+        cached = _memory.get(url)
+    if cached is None:
+        content, digest = bundle_sheet(url)
+        cached = _CachedSheet(_parse(content), digest)
+        with _lock:
+            _memory[url] = cached
+    return cached
+
+
+def _get_sheet(url, ttl=None, background_refresh=False):
+    if is_offline():
+        return _get_offline_sheet(url)
+    ttl = sheet_ttls.get(url, default_ttl) if ttl is None else ttl
+    with _lock:
+        cached = _memory.get(url)
+        retry_at = _next_retry.get(url, 0)
+    if cached is None:
+        cached = _load_from_disk(url)
+        if cached is not None:
+            with _lock:
+                _memory.setdefault(url, cached)
+    if cached is not None and (time.time() - cached.fetched_at < ttl or time.time() < retry_at):
+        return cached
+    if cached is not None and background_refresh:
+        # Serve the expired copy right away and revalidate it off the request path
+        _refresh_in_background(url, cached)
+        return cached
+    return _flights.do(url, _refresh, url, cached)
+
+
+def read_sheet(url, ttl=None, background_refresh=False):
+    """Return a Google Sheets CSV export as a DataFrame, from cache while it is fresh.
+
+    Args:
+        url (str): CSV export URL of the sheet.
+        ttl (float): Seconds a cached copy stays fresh, defaults to the sheet's registered TTL.
+        background_refresh (bool): Return an expired copy immediately and refresh it in the
+            background instead of waiting for Google.
+
+    Returns:
+        DataFrame: A copy the caller is free to modify.
+    """
+    return _get_sheet(url, ttl, background_refresh).df.copy()
+
+
+def read_sheet_with_digest(url, ttl=None):
+    """Return a copy of the sheet together with the SHA-256 hash of its CSV content."""
+    sheet = _get_sheet(url, ttl)
+    return sheet.df.copy(), sheet.digest
+
+
+def sheet_digest(url):
+    """Return the SHA-256 hash of the sheet's current CSV content, revalidating it once its TTL expired."""
+    return _get_sheet(url).digest
+
+
+def sheet_content(url):
+    """Return the raw CSV bytes and the digest of a sheet, downloading it if needed."""
+    sheet = _get_sheet(url)
+    with open(_cache_paths(url)[0], "rb") as f:
+        return f.read(), sheet.digest
+
+
+def register_sheet(name, url, ttl=None):
+    """Register a sheet the dashboard reads, so it is included in prefetch_sheets."""
+    registered_sheets[name] = url
+    if ttl is not None:
+        sheet_ttls[url] = ttl
+    return url
+
+
+def prefetch_sheets(urls=None, max_workers=8):
+    """Load sheets into the cache concurrently, all registered sheets by default.
+
+    Startup then waits for the slowest sheet instead of the sum of all downloads.
+
+    Returns:
+        dict: Exceptions of the sheets that could not be loaded, keyed by URL.
+    """
+    urls = list(dict.fromkeys(registered_sheets.values() if urls is None else urls))
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sheet-prefetch") as pool:
+        futures = {url: pool.submit(_get_sheet, url) for url in urls}
+        for url, future in futures.items():
+            try:
+                future.result()
+            except Exception as error:
+                logger.warning("Could not prefetch sheet %s", url, exc_info=True)
+                errors[url] = error
+    return errors
@@ -0,0 +1,70 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Concurrent Speckle fetch layer.
+# Blocking Speckle calls are run on worker threads from an asyncio loop with a cap on
+# the number of calls in flight, so the wall-clock time of a batch is bounded by its
+# slowest call rather than the sum of all of them. Calls may page through several
+# requests and wait for the rate limiter, so they are not timed out as a whole: every
+# GraphQL request has its own timeout (speckle_session.request_timeout).
+# The worker threads live for the whole process, so the connected GraphQL session each
+# of them holds is reused by every later batch.
+# Synchronous callers use run_concurrently and get plain results back.
+
+max_concurrency = int(os.environ.get("HYPERB_FETCH_CONCURRENCY", 8))
+
+_executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="speckle-fetch")
+
+
+async def _bounded_call(semaphore, fn, args):
+    async with semaphore:
+        # Copy the context so the caller's rate limit priority carries over to the worker
+        call = functools.partial(contextvars.copy_context().run, fn, *args)
+        return await asyncio.get_running_loop().run_in_executor(_executor, call)
+
+
+async def gather_bounded(calls, concurrency=None):
+    """Run blocking calls concurrently, at most `concurrency` at a time.
+
+    Args:
+        calls (list): (function, args) pairs.
+        concurrency (int): Maximum number of calls in flight, at most max_concurrency.
+
+    Returns:
+        list: Results in the order of calls. The first failure is raised.
+    """
+    semaphore = asyncio.Semaphore(concurrency or max_concurrency)
+    return await asyncio.gather(*(_bounded_call(semaphore, fn, tuple(args)) for fn, args in calls))
+
+
+def run_concurrently(calls, concurrency=None):
+    """Synchronous entry point for gather_bounded, usable from any thread."""
+    if not calls:
+        return []
+    coroutine = gather_bounded(calls, concurrency)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    # Called from inside a running event loop: run the batch on a loop of its own thread
+    result = {}
+
+    def runner():
+        try:
+            result["value"] = asyncio.run(coroutine)
+        except BaseException as error:
+            result["error"] = error
+
+    # Copy the context so the caller's rate limit priority carries over to the workers
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(runner,), name="speckle-async-fetch")
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
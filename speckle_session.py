@@ -0,0 +1,101 @@
+import json
+import os
+import re
+import threading
+
+from rate_limit import INTERACTIVE, BACKGROUND, TokenBucketLimiter
+from single_flight import SingleFlight
+from startup_profile import phase
+
+# Shared Speckle session for every dashboard page.
+# The client authenticates once per process. Its gql transport connects and closes a
+# requests session on every call, so raw GraphQL queries instead run on one connected
+# session per thread: each thread keeps its HTTP connections alive between queries and
+# threads never share (or close) each other's session. Calls through the specklepy
+# client itself are serialised. The project itself is held by project_snapshot.
+# Every request to the server takes a token from one process-wide rate limiter.
+# specklepy and gql are imported on the first request, so modules that only read the
+# snapshot (or run from an offline bundle) never load them.
+
+speckle_server = "macad.speckle.xyz"
+project_id = "28a211b286"  # hyperB project
+models_limit = 100  # page size, project_snapshot follows the cursor for the rest
+# Seconds allowed per GraphQL request once it is sent, the rate limiter wait is not included
+request_timeout = float(os.environ.get("HYPERB_FETCH_TIMEOUT", 30))
+
+# Interactive callers give up after 10s in the queue, background refreshes wait their turn
+speckle_limiter = TokenBucketLimiter(
+    rate=float(os.environ.get("HYPERB_SPECKLE_RATE", 10)),
+    burst=int(os.environ.get("HYPERB_SPECKLE_BURST", 20)),
+    max_wait={INTERACTIVE: 10.0, BACKGROUND: None},
+)
+
+_lock = threading.RLock()
+_client = None
+_client_lock = threading.Lock()
+_sessions = threading.local()
+_flights = SingleFlight()
+
+
+def get_client():
+    """Return the authenticated Speckle client, creating it on first use."""
+    global _client
+    with _lock:
+        if _client is None:
+            # Imported here so the dashboard can run from an offline bundle without credentials
+            from config import speckle_token
+            from specklepy.api.client import SpeckleClient
+            from specklepy.api.credentials import get_account_from_token
+            client = SpeckleClient(host=speckle_server)
+            with phase("speckle", "authenticate"):
+                account = speckle_limiter.call(get_account_from_token, speckle_token, speckle_server)
+            client.authenticate_with_account(account)
+            _client = client
+        return _client
+
+
+def call_client(fn, *args, **kwargs):
+    """Call a method of the shared specklepy client through the rate limiter, one call at a time.
+
+    specklepy connects and closes the client's single transport on every request, so
+    concurrent calls would run on a session another thread has just closed.
+    """
+    speckle_limiter.acquire()
+    with _client_lock:
+        return fn(*args, **kwargs)
+
+
+def _new_transport():
+    # A transport of its own, with the endpoint and credentials of the authenticated client
+    from gql.transport.requests import RequestsHTTPTransport
+    shared = get_client().httpclient.transport
+    return RequestsHTTPTransport(url=shared.url, headers=shared.headers, cookies=shared.cookies, auth=shared.auth,
+                                 verify=shared.verify, retries=shared.retries, timeout=request_timeout)
+
+
+def _session():
+    """Return the connected GraphQL session of the current thread, connecting it on first use."""
+    session = getattr(_sessions, "session", None)
+    if session is None:
+        from gql import Client
+        session = Client(transport=_new_transport()).connect_sync()
+        _sessions.session = session
+    return session
+
+
+def execute_query(query, variables=None):
+    """Run a raw GraphQL query against the Speckle server with the shared client.
+
+    Identical queries issued concurrently share one in-flight request.
+    """
+    variables = variables or {}
+    key = (query, json.dumps(variables, sort_keys=True))
+    return _flights.do(key, _execute, query, variables)
+
+
+def _execute(query, variables):
+    # Named after the GraphQL operation in the startup profile
+    from gql import gql
+    operation = re.search(r"(?:query|mutation)\s+(\w+)", query)
+    with phase("speckle", operation.group(1) if operation else "query"):
+        return speckle_limiter.call(_session().execute, gql(query), variable_values=variables)
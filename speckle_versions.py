@@ -0,0 +1,133 @@
+import pandas as pd
+from speckle_session import project_id, execute_query
+
+# Bulk version loader.
+# Versions for every model are fetched with one GraphQL query per page of models
+# (instead of one get_versions call per model). The rows are persisted and served
+# as a single table by version_store.
+
+models_page_size = 50
+versions_limit = 100
+
+VERSION_COLUMNS = ["id", "model_id", "model_name", "author", "sourceApplication", "createdAt", "message", "referencedObject"]
+
+PROJECT_VERSIONS_QUERY = """
+query ProjectVersions($projectId: String!, $modelsLimit: Int!, $modelsCursor: String, $versionsLimit: Int!) {
+  project(id: $projectId) {
+    models(limit: $modelsLimit, cursor: $modelsCursor) {
+      totalCount
+      cursor
+      items {
+        id
+        name
+        versions(limit: $versionsLimit) {
+          totalCount
+          cursor
+          items {
+            id
+            message
+            sourceApplication
+            createdAt
+            referencedObject
+            authorUser {
+              name
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+MODEL_VERSIONS_QUERY = """
+query ModelVersions($projectId: String!, $modelId: String!, $versionsLimit: Int!, $versionsCursor: String) {
+  project(id: $projectId) {
+    model(id: $modelId) {
+      versions(limit: $versionsLimit, cursor: $versionsCursor) {
+        totalCount
+        cursor
+        items {
+          id
+          message
+          sourceApplication
+          createdAt
+          referencedObject
+          authorUser {
+            name
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def version_rows(model, versions):
+    """Flatten the GraphQL version items of one model into version table rows."""
+    return [
+        {
+            "id": v["id"],
+            "model_id": model["id"],
+            "model_name": model["name"],
+            "author": (v.get("authorUser") or {}).get("name"),
+            "sourceApplication": v.get("sourceApplication"),
+            "createdAt": v.get("createdAt"),
+            "message": v.get("message"),
+            "referencedObject": v.get("referencedObject"),
+        }
+        for v in versions
+    ]
+
+
+def to_version_table(rows):
+    """Build the version table DataFrame, newest version first."""
+    table = pd.DataFrame(rows, columns=VERSION_COLUMNS)
+    table["createdAt"] = pd.to_datetime(table["createdAt"], utc=True)
+    return table.sort_values("createdAt", ascending=False, ignore_index=True)
+
+
+def iter_models_with_versions(limit=versions_limit):
+    """Yield every model with its first `limit` versions, fetching one page of models at a time.
+
+    Pages are only requested as the caller consumes the models, following the model cursor
+    until the project is exhausted.
+    """
+    cursor = None
+    while True:
+        response = execute_query(PROJECT_VERSIONS_QUERY, {
+            "projectId": project_id,
+            "modelsLimit": models_page_size,
+            "modelsCursor": cursor,
+            "versionsLimit": limit,
+        })
+        page = response["project"]["models"]
+        yield from page["items"]
+        cursor = page.get("cursor")
+        if not cursor or len(page["items"]) < models_page_size:
+            break
+
+
+def fetch_model_versions_page(model_id, cursor=None):
+    """Fetch one page of versions of a single model, newest first."""
+    response = execute_query(MODEL_VERSIONS_QUERY, {
+        "projectId": project_id,
+        "modelId": model_id,
+        "versionsLimit": versions_limit,
+        "versionsCursor": cursor,
+    })
+    return response["project"]["model"]["versions"]
+
+
+def iter_model_versions(model_id, cursor=None):
+    """Yield the pages of versions of a single model after cursor, newest first."""
+    while True:
+        page = fetch_model_versions_page(model_id, cursor)
+        if not page["items"]:
+            break
+        yield page
+        cursor = page.get("cursor")
+        if not cursor or len(page["items"]) < versions_limit:
+            break
+
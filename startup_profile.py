@@ -0,0 +1,154 @@
+import contextlib
+import os
+import sys
+import threading
+import time
+
+# Startup profiler.
+# With HYPERB_PROFILE=1 the dashboard records the wall time of every module import,
+# Speckle request, sheet download, figure build and page load during startup, and
+# app.py prints them as a waterfall before launching. Import this module first so the
+# import timer sees every later import. Profiling is a no-op when the flag is unset.
+
+enabled = os.environ.get("HYPERB_PROFILE", "") not in ("", "0")
+# Phases shorter than this are left out of the waterfall (they still count in the totals)
+min_seconds = float(os.environ.get("HYPERB_PROFILE_MIN_MS", 5)) / 1000
+
+_started = time.perf_counter()
+_lock = threading.Lock()
+_phases = []
+_local = threading.local()
+
+
+class Phase:
+    __slots__ = ("kind", "name", "start", "end", "thread", "depth", "child_seconds")
+
+    def __init__(self, kind, name, start, thread, depth):
+        self.kind = kind
+        self.name = name
+        self.start = start
+        self.end = None
+        self.thread = thread
+        self.depth = depth
+        self.child_seconds = 0.0
+
+    @property
+    def seconds(self):
+        return self.end - self.start
+
+    @property
+    def self_seconds(self):
+        return self.seconds - self.child_seconds
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+@contextlib.contextmanager
+def phase(kind, name):
+    """Record the wall time of the block as a phase of the given kind (import, speckle, sheet, ...)."""
+    if not enabled:
+        yield
+        return
+    stack = _stack()
+    record = Phase(kind, name, time.perf_counter(), threading.current_thread().name, len(stack))
+    stack.append(record)
+    try:
+        yield
+    finally:
+        record.end = time.perf_counter()
+        stack.pop()
+        if stack:
+            stack[-1].child_seconds += record.seconds
+        with _lock:
+            _phases.append(record)
+
+
+class _TimedLoader:
+    """Loader proxy that times the execution of one module and delegates everything else."""
+
+    def __init__(self, loader, fullname):
+        self._loader = loader
+        self._fullname = fullname
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        create_module = getattr(self._loader, "create_module", None)
+        return create_module(spec) if create_module is not None else None
+
+    def exec_module(self, module):
+        # The module only ever sees its real loader
+        module.__loader__ = self._loader
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self._loader
+        with phase("import", self._fullname):
+            self._loader.exec_module(module)
+
+
+class _ImportTimer:
+    """Meta path finder that times the execution of every module loaded after it is installed."""
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        # Built-in and frozen importers are classes shared by every module, leave them alone
+        if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"):
+            return spec
+        spec.loader = _TimedLoader(loader, fullname)
+        return spec
+
+
+def install():
+    """Start timing imports, once per process."""
+    if enabled and not any(isinstance(finder, _ImportTimer) for finder in sys.meta_path):
+        sys.meta_path.insert(0, _ImportTimer())
+
+
+def report(out=None, width=40):
+    """Print the recorded phases as a waterfall in start order, then the slowest phases and totals per kind."""
+    if not enabled:
+        return
+    out = out or sys.stdout
+    with _lock:
+        phases = sorted((p for p in _phases if p.end is not None), key=lambda p: p.start)
+    if not phases:
+        return
+    total = max(p.end for p in phases) - _started
+    scale = width / total if total > 0 else 0
+
+    print(f"\nStartup profile: {total:.2f}s until launch, {len(phases)} phases", file=out)
+    print(f"{'start':>8} {'seconds':>8} {'self':>8}  {'kind':<8} {'thread':<14} name", file=out)
+    for p in phases:
+        if p.seconds < min_seconds:
+            continue
+        offset = int((p.start - _started) * scale)
+        bar = " " * offset + "#" * max(1, int(p.seconds * scale))
+        print(f"{p.start - _started:8.3f} {p.seconds:8.3f} {p.self_seconds:8.3f}  {p.kind:<8} {p.thread[:14]:<14} "
+              f"{'  ' * p.depth}{p.name}\n{'':>8} |{bar:<{width}}|", file=out)
+
+    print("\nSlowest phases (self time):", file=out)
+    for p in sorted(phases, key=lambda p: -p.self_seconds)[:15]:
+        print(f"  {p.self_seconds:8.3f}s  {p.kind:<8} {p.name}", file=out)
+
+    # Nested phases count towards their own kind, so the totals do not overlap
+    print("\nSelf time per kind (summed over threads):", file=out)
+    totals = {}
+    for p in phases:
+        totals[p.kind] = totals.get(p.kind, 0.0) + p.self_seconds
+    for kind, seconds in sorted(totals.items(), key=lambda item: -item[1]):
+        print(f"  {kind:<8} {seconds:8.3f}s", file=out)
+
+
+install()
@@ -0,0 +1,73 @@
+# Team taxonomy over Speckle model names.
+# Model names are prefixed by the team that owns them ('residential/shared/...',
+# 'structure/share/...', 'service/...'). A prefix tree is built once per project
+# snapshot so "models for team X" and "team for model Y" are dictionary lookups.
+
+# Top-level prefix of every team's models
+TEAM_PREFIXES = {
+    "Residential": "residential",
+    "Structure": "structure",
+    "Service": "service",
+    "Facade": "facade",
+    "Industrial": "industrial",
+    "Data": "data",
+}
+
+# Prefix of the models each team shares with the rest of the dashboard
+TEAM_MODEL_PREFIXES = {
+    "Residential": "residential/share",
+    "Structure": "structure/share",
+    "Service": "service",
+    "Facade": "facade",
+    "Industrial": "industrial",
+    "Data": "data",
+}
+
+OTHER_TEAM = "Other"
+
+
+class _Node:
+    __slots__ = ("children", "names")
+
+    def __init__(self):
+        self.children = {}
+        self.names = []
+
+
+class TeamTaxonomy:
+    """Prefix tree over the model names of one project snapshot."""
+
+    def __init__(self, model_names):
+        self.root = _Node()
+        for name in model_names:
+            node = self.root
+            node.names.append(name)
+            for char in name:
+                node = node.children.setdefault(char, _Node())
+                node.names.append(name)
+
+        self._prefix_cache = {}
+        self.models_by_team = {team: self.models_with_prefix(prefix) for team, prefix in TEAM_MODEL_PREFIXES.items()}
+        self.team_by_model = {}
+        for team, prefix in TEAM_PREFIXES.items():
+            for name in self.models_with_prefix(prefix):
+                self.team_by_model.setdefault(name, team)
+
+    def models_with_prefix(self, prefix):
+        """Return the model names starting with prefix, in project order."""
+        if prefix not in self._prefix_cache:
+            node = self.root
+            for char in prefix:
+                node = node.children.get(char)
+                if node is None:
+                    break
+            self._prefix_cache[prefix] = list(node.names) if node is not None else []
+        return self._prefix_cache[prefix]
+
+    def models_for_team(self, team):
+        """Return the names of the models a team shares on the dashboard."""
+        return self.models_by_team.get(team, [])
+
+    def team_for_model(self, model_name):
+        """Return the team owning a model, or 'Other'."""
+        return self.team_by_model.get(model_name, OTHER_TEAM)
@@ -1,9 +1,6 @@
-import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objs as go
 import json
-import numpy as np
+from carbon_io import COLUMNAR_TYPES, PARQUET_MIME, has_pyarrow, is_columnar, read_table, to_parquet_bytes
 
 # Carbon emission factors (kg CO2 per kg of material)
 CARBON_EMISSION_FACTORS = {
@@ -17,24 +14,40 @@ CARBON_EMISSION_FACTORS = {
     'plastic': 2.5,     # kg CO2 per kg of plastic
 }
 
+REQUIRED_COLUMNS = ['category', 'material', 'density', 'volume', 'quantity']
+
+def validate_columns(df):
+    """Report the first missing required column, return whether all are present"""
+    import streamlit as st
+    for col in REQUIRED_COLUMNS:
+        if col not in df.columns:
+            st.error(f"Missing required column: {col}")
+            return False
+    return True
+
 def load_json_data(uploaded_file):
     """Load and validate JSON data"""
+    import streamlit as st
     try:
         data = json.load(uploaded_file)
         df = pd.DataFrame(data)
         
         # Validate required columns
-        required_columns = ['category', 'material', 'density', 'volume', 'quantity']
-        for col in required_columns:
-            if col not in df.columns:
-                st.error(f"Missing required column: {col}")
-                return None
-        
-        return df
+        return df if validate_columns(df) else None
     except json.JSONDecodeError:
         st.error("Invalid JSON file. Please upload a properly formatted JSON.")
         return None
 
+def load_table_data(uploaded_file):
+    """Load and validate a Parquet or Arrow file, reading only the required columns"""
+    import streamlit as st
+    try:
+        df = read_table(uploaded_file, REQUIRED_COLUMNS)
+    except Exception as e:
+        st.error(f"Could not read the file: {e}")
+        return None
+    return df if validate_columns(df) else None
+
 def calculate_carbon_emissions(df):
     """Calculate carbon emissions for each material"""
     # Calculate mass and carbon emissions
@@ -59,6 +72,7 @@ def create_emissions_summary(df):
 
 def create_pie_chart(emissions_summary):
     """Create pie chart of emissions by category"""
+    import plotly.express as px
     fig = px.pie(
         emissions_summary, 
         values='carbon_emissions', 
@@ -70,6 +84,7 @@ def create_pie_chart(emissions_summary):
 
 def create_bar_plot(emissions_summary):
     """Create bar plot of emissions by category"""
+    import plotly.express as px
     fig = px.bar(
         emissions_summary, 
         x='category', 
@@ -81,6 +96,7 @@ def create_bar_plot(emissions_summary):
 
 def create_material_emissions_plot(df):
     """Create bar plot of emissions by material"""
+    import plotly.express as px
     material_emissions = df.groupby('material')['carbon_emissions'].sum().reset_index()
     material_emissions = material_emissions.sort_values('carbon_emissions', ascending=False)
     
@@ -94,6 +110,8 @@ def create_material_emissions_plot(df):
     return fig
 
 def main():
+    import streamlit as st
+
     st.set_page_config(page_title="Architectural Carbon Emissions Analyzer", layout="wide")
     
     st.title("🏗️ Architectural Carbon Emissions Analysis")
@@ -102,8 +120,8 @@ def main():
     st.sidebar.header("Upload Building Materials Data")
     uploaded_file = st.sidebar.file_uploader(
         "Choose a JSON file", 
-        type=['json'],
-        help="Upload a JSON file with building materials data"
+        type=['json'] + (COLUMNAR_TYPES if has_pyarrow() else []),
+        help="Upload a JSON, Parquet or Arrow file with building materials data"
     )
     
     # Emissions Factors Expander
@@ -114,7 +132,7 @@ def main():
     
     if uploaded_file is not None:
         # Load and process data
-        df = load_json_data(uploaded_file)
+        df = load_table_data(uploaded_file) if is_columnar(uploaded_file) else load_json_data(uploaded_file)
         
         if df is not None:
             # Calculate carbon emissions
@@ -168,7 +186,7 @@ def main():
             
             # Download Options
             st.header("Download Analysis")
-            col1, col2 = st.columns(2)
+            col1, col2, col3 = st.columns(3)
             
             with col1:
                 csv = df.to_csv(index=False)
@@ -187,6 +205,15 @@ def main():
                     file_name="architectural_carbon_emissions.json",
                     mime="application/json"
                 )
+            
+            if has_pyarrow():
+                with col3:
+                    st.download_button(
+                        label="Download Detailed Data as Parquet",
+                        data=to_parquet_bytes(df),
+                        file_name="architectural_carbon_emissions.parquet",
+                        mime=PARQUET_MIME
+                    )
     
     else:
         # Welcome/Instructions
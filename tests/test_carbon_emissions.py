@@ -0,0 +1,66 @@
+import gc
+import time
+
+import pytest
+
+pytest.importorskip("pandas")
+from CO2analysis import HyperbuildingCarbonAnalyzer
+
+ROWS = 200000
+
+
+def baseline_emissions(analyzer, data):
+    """The per-entry loop calculate_carbon_emissions replaced."""
+    emissions_data = []
+    for item in data:
+        if not all(key in item for key in ('material', 'material_type', 'density', 'volume')):
+            continue
+        try:
+            emission_factor = analyzer.EMISSION_FACTORS[item['material']][item['material_type']]
+        except KeyError:
+            emission_factor = 0.5
+        mass = item['density'] * item['volume']
+        emissions_data.append({**item, 'mass': mass, 'emission_factor': emission_factor,
+                               'carbon_emissions': mass * emission_factor})
+    return emissions_data
+
+
+def takeoff(rows):
+    materials = [('concrete', 'standard'), ('steel', 'recycled'), ('glass', 'triple_glazed'), ('timber', 'clt')]
+    data = []
+    for i in range(rows):
+        material, material_type = materials[i % len(materials)]
+        data.append({'component': f'c{i % 7}', 'material': material, 'material_type': material_type,
+                     'density': 1.0 + i % 5, 'volume': 10.0 + i % 11})
+    data[3] = {'material': 'steel', 'density': 7.8}  # Skipped
+    return data
+
+
+def run_time(fn):
+    # Collections triggered by the other run would otherwise land in this one
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        fn()
+        return time.perf_counter() - started
+    finally:
+        gc.enable()
+
+
+def test_matches_baseline_loop():
+    analyzer = HyperbuildingCarbonAnalyzer()
+    data = takeoff(1000)
+    assert analyzer.calculate_carbon_emissions(data) == baseline_emissions(analyzer, data)
+    assert analyzer.validation_report['invalid_rows'] == 1
+
+
+def test_no_slower_than_baseline_loop():
+    analyzer = HyperbuildingCarbonAnalyzer()
+    data = takeoff(ROWS)
+    baseline, vectorized = [], []
+    # Alternate the runs so both see the same machine load
+    for _ in range(5):
+        baseline.append(run_time(lambda: baseline_emissions(analyzer, data)))
+        vectorized.append(run_time(lambda: analyzer.calculate_carbon_emissions(data)))
+    assert min(vectorized) <= min(baseline), f"{min(vectorized):.3f}s against {min(baseline):.3f}s for the loop"
@@ -0,0 +1,25 @@
+import pytest
+
+pytest.importorskip("pandas")
+from CO2analysis import HyperbuildingCarbonAnalyzer
+
+
+def test_summaries_per_group():
+    analyzer = HyperbuildingCarbonAnalyzer()
+    df = analyzer.calculate_emissions_frame([
+        {'component': 'core', 'material': 'concrete', 'material_type': 'standard', 'density': 2.4, 'volume': 50},
+        {'component': 'facade', 'material': 'glass', 'material_type': 'unknown', 'density': 2.5, 'volume': 4},
+    ])
+    result = analyzer.simulate_uncertainty(df, 2000, workers=1, seed=1)
+    total = result['summaries']['total'].iloc[0]
+    assert total['point_estimate'] == pytest.approx(df['carbon_emissions'].sum())
+    assert total['ci_low'] < total['point_estimate'] < total['ci_high']
+    assert list(result['summaries']['component'].index) == ['core', 'facade']
+
+
+@pytest.mark.parametrize('data', [[], [{'material': 'steel'}, {}]])
+def test_no_valid_rows(data):
+    analyzer = HyperbuildingCarbonAnalyzer()
+    df = analyzer.calculate_emissions_frame(data)
+    with pytest.raises(ValueError, match="at least one calculated row"):
+        analyzer.simulate_uncertainty(df, 1000, workers=1)
@@ -0,0 +1,30 @@
+import io
+import json
+
+import pytest
+
+pytest.importorskip("pandas")
+from CO2analysis import iter_json_array
+
+RECORDS = [{'material': 'steel', 'volume': 12.5}, {'material': 'glass', 'note': 'a ] b'}, [], 3, None]
+
+
+@pytest.mark.parametrize('buffer_size', [1, 3, 1 << 20])
+@pytest.mark.parametrize('binary', [False, True])
+def test_items_across_buffers(buffer_size, binary):
+    text = ' ' + json.dumps(RECORDS, indent=2) + '\n\n'
+    source = io.BytesIO(text.encode()) if binary else io.StringIO(text)
+    assert list(iter_json_array(source, buffer_size)) == RECORDS
+
+
+@pytest.mark.parametrize('buffer_size', [1, 4, 1 << 20])
+@pytest.mark.parametrize('trailing', ['x', ']', '[1]', '  \n {}'])
+def test_content_after_the_array(buffer_size, trailing):
+    source = io.StringIO(json.dumps(RECORDS) + trailing)
+    with pytest.raises(ValueError, match='Extra data'):
+        list(iter_json_array(source, buffer_size))
+
+
+def test_not_an_array():
+    with pytest.raises(ValueError, match='Expected a JSON array'):
+        list(iter_json_array(io.StringIO('{"material": "steel"}')))
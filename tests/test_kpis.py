@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("pandas")
+import kpis
+from sheet_registry import RESIDENTIAL_UNITS, SERVICE_AREAS, SERVICE_AMENITIES, SERVICE_OPEN_SPACE, FACADE_TYPES, \
+    STRUCTURE_WIND_LOADS, sheet_breakdown
+
+SHEETS = {
+    RESIDENTIAL_UNITS: pd.DataFrame({"TYPE": ["Studio", "1-Bedroom", "Total"], "QUANTITY": ["1 200", "800", "2 000"],
+                                     "AREA": ["30.5", "49.5", "80"], "POPULATION": [1200, 1600, 2800]}),
+    SERVICE_AREAS: pd.DataFrame({"Function": ["Retail", "Education", "Total", "Per person"],
+                                 "Area, sq.m.": ["1,000", "2,000", "3,000", "0.5"]}),
+    SERVICE_AMENITIES: pd.DataFrame({"Amenity type": ["Gym", "Clinic"], "time, min": [4, 8]}),
+    SERVICE_OPEN_SPACE: pd.DataFrame({"Description": ["Park", "Total", "Per person"], "Area, sq.m.": [500, 500, 1]}),
+    FACADE_TYPES: pd.DataFrame({"NAME": ["PV", "Glass", "Total"], "%": ["40%", "60%", "100%"]}),
+    STRUCTURE_WIND_LOADS: pd.DataFrame({"Tower number": [1, 2], "Reduction, %": [10, 20]}),
+}
+
+
+@pytest.fixture(autouse=True)
+def sheets(monkeypatch):
+    monkeypatch.setattr(kpis, "read_sheet", lambda url: SHEETS[url].copy())
+
+
+def test_totals_rows_are_left_out():
+    residential = kpis.residential_kpis()
+    assert residential["units"] == {"Studio": 1200.0, "1-Bedroom": 800.0}
+    assert residential["total_unit_area_m2"] == 80.0
+    service = kpis.service_kpis()
+    assert service["area_m2"] == {"Retail": 1000.0, "Education": 2000.0}
+    assert service["total_open_area_m2"] == 500.0
+    assert service["mean_amenity_travel_time_min"] == 6.0
+    assert kpis.facade_kpis()["facade_type_pct"] == {"PV": 40.0, "Glass": 60.0}
+    assert kpis.structure_kpis()["mean_wind_load_reduction_pct"] == 15.0
+
+
+def test_pages_chart_the_same_rows():
+    # The pages chart sheet_breakdown, the KPIs are computed from the same rows
+    names, values = sheet_breakdown(SHEETS[SERVICE_AREAS], SERVICE_AREAS, "Area, sq.m.")
+    assert names == list(kpis.service_kpis()["area_m2"])
+    assert values == ["1,000", "2,000"]
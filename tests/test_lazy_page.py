@@ -0,0 +1,30 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pandas")
+import lazy_page
+from lazy_page import LazyPage
+
+
+@pytest.fixture
+def snapshot(monkeypatch):
+    current = SimpleNamespace(signature=("models", "v1"))
+    monkeypatch.setattr(lazy_page, "get_snapshot", lambda: current)
+    return current
+
+
+def test_reloads_when_the_snapshot_changes(snapshot):
+    loads = []
+    page = LazyPage("test", lambda: loads.append(snapshot.signature) or len(loads))
+
+    assert page.data() == 1
+    assert page.data() == 1
+    # A refresh with the same models and versions keeps the loaded data
+    snapshot.signature = ("models", "v1")
+    assert page.data() == 1
+
+    snapshot.signature = ("models", "v2")
+    assert page.data() == 2
+    assert page._current()[2] == 2
+    assert loads == [("models", "v1"), ("models", "v2")]
@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("gql")
+from gql.transport import Transport
+from gql.transport.exceptions import TransportAlreadyConnected, TransportClosed
+from graphql import ExecutionResult
+
+import speckle_async
+import speckle_session
+
+QUERY = """
+query Echo($value: Int!) {
+  echo(value: $value)
+}
+"""
+
+
+class FakeTransport(Transport):
+    """Sync transport with the connect/close rules of RequestsHTTPTransport."""
+
+    def __init__(self, created):
+        self.connected = False
+        self.threads = set()
+        created.append(self)
+
+    def connect(self):
+        if self.connected:
+            raise TransportAlreadyConnected("Transport is already connected")
+        self.connected = True
+
+    def close(self):
+        self.connected = False
+
+    def execute(self, document, variable_values=None, **kwargs):
+        if not self.connected:
+            raise TransportClosed("Transport is not connected")
+        self.threads.add(threading.get_ident())
+        time.sleep(0.01)  # Long enough for the calls to overlap
+        if not self.connected:
+            raise TransportClosed("Transport was closed during the request")
+        return ExecutionResult(data={"echo": variable_values["value"]})
+
+
+@pytest.fixture
+def transports(monkeypatch):
+    created = []
+    monkeypatch.setattr(speckle_session, "_new_transport", lambda: FakeTransport(created))
+    monkeypatch.setattr(speckle_session, "_sessions", threading.local())
+    return created
+
+
+def test_concurrent_queries_use_one_session_per_thread(transports):
+    n = 40
+    calls = [(speckle_session.execute_query, (QUERY, {"value": i})) for i in range(n)]
+
+    results = speckle_async.run_concurrently(calls)
+    assert [r["echo"] for r in results] == list(range(n))
+
+    # A second batch reuses the sessions of the pool threads instead of connecting new ones
+    speckle_async.run_concurrently(calls)
+    assert 1 < len(transports) <= speckle_async.max_concurrency
+    assert all(t.connected and len(t.threads) == 1 for t in transports)
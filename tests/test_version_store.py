@@ -0,0 +1,80 @@
+import pytest
+
+pytest.importorskip("pandas")
+import speckle_versions
+import version_store
+
+
+class FakeProject:
+    """Serves the version queries of speckle_versions from in-memory version histories."""
+
+    def __init__(self, histories):
+        self.histories = histories  # model id -> versions, newest first
+        self.requests = []
+
+    def add_version(self, model_id, created_at):
+        self.histories[model_id].insert(0, version(f"{model_id}-{created_at}", created_at))
+
+    def page(self, model_id, limit, cursor):
+        history = self.histories[model_id]
+        start = int(cursor or 0)
+        return {"totalCount": len(history), "cursor": str(start + limit), "items": history[start:start + limit]}
+
+    def execute_query(self, query, variables):
+        if "modelsLimit" in variables:
+            self.requests.append(("models", variables["versionsLimit"]))
+            items = [{"id": model_id, "name": f"Model {model_id}",
+                      "versions": self.page(model_id, variables["versionsLimit"], None)}
+                     for model_id in self.histories]
+            return {"project": {"models": {"totalCount": len(items), "cursor": None, "items": items}}}
+        self.requests.append((variables["modelId"], variables["versionsCursor"]))
+        page = self.page(variables["modelId"], variables["versionsLimit"], variables["versionsCursor"])
+        return {"project": {"model": {"versions": page}}}
+
+
+def version(version_id, created_at):
+    return {"id": version_id, "message": None, "sourceApplication": "test", "referencedObject": version_id,
+            "createdAt": created_at, "authorUser": {"name": "tester"}}
+
+
+def history(model_id, count):
+    return [version(f"{model_id}-{i}", f"2024-01-01T{i // 60:02d}:{i % 60:02d}:00Z") for i in reversed(range(count))]
+
+
+@pytest.fixture
+def project(monkeypatch, tmp_path):
+    fake = FakeProject({"a": history("a", 5), "b": history("b", 250)})
+    monkeypatch.setattr(speckle_versions, "execute_query", fake.execute_query)
+    monkeypatch.setattr(version_store, "store_path", str(tmp_path / "versions.sqlite"))
+    monkeypatch.setattr(version_store, "_version_table", None)
+    return fake
+
+
+def test_first_sync_stores_every_version(project):
+    assert version_store.sync_versions() == 255
+    # Only the long history is paged past the versions embedded in the model list
+    assert project.requests == [("models", 100), ("b", "100"), ("b", "200")]
+
+
+def test_sync_probes_only_the_newest_version(project):
+    version_store.sync_versions()
+    project.requests.clear()
+
+    assert version_store.sync_versions() == 0
+    assert project.requests == [("models", 1)]
+
+    project.requests.clear()
+    project.add_version("b", "2024-02-01T00:00:00Z")
+    assert version_store.sync_versions() == 1
+    assert project.requests == [("models", 1), ("b", "1")]
+    table = version_store.read_version_table()
+    assert len(table) == 256
+    assert table.iloc[0]["id"] == "b-2024-02-01T00:00:00Z"
+
+
+def test_refresh_replaces_the_shared_table(project):
+    assert len(version_store.get_version_table()) == 255
+    project.add_version("a", "2024-02-01T00:00:00Z")
+    assert len(version_store.get_version_table()) == 255
+    assert len(version_store.get_version_table(refresh=True)) == 256
+    assert len(version_store.get_version_table()) == 256
@@ -0,0 +1,137 @@
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+from offline_bundle import is_offline, load_bundle
+from speckle_async import run_concurrently
+from speckle_versions import VERSION_COLUMNS, versions_limit, iter_models_with_versions, iter_model_versions, version_rows, to_version_table
+
+# Persisted local store for version metadata.
+# Versions are kept in SQLite so the commit history survives restarts, and each sync
+# only downloads versions newer than the last stored createdAt of every model.
+
+store_path = os.environ.get("HYPERB_VERSION_STORE", os.path.join(".cache", "versions.sqlite"))
+
+_lock = threading.Lock()
+_sync_lock = threading.Lock()
+_version_table = None
+
+
+def connect():
+    """Open the version store, creating the table on first use."""
+    directory = os.path.dirname(store_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(store_path)
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS versions (
+            id TEXT PRIMARY KEY,
+            model_id TEXT NOT NULL,
+            model_name TEXT,
+            author TEXT,
+            sourceApplication TEXT,
+            createdAt TEXT NOT NULL,
+            message TEXT,
+            referencedObject TEXT
+        )
+    """)
+    connection.execute("CREATE INDEX IF NOT EXISTS versions_model_created ON versions (model_id, createdAt)")
+    return connection
+
+
+def load_cursors(connection):
+    """Return the newest stored createdAt per model id."""
+    rows = connection.execute("SELECT model_id, MAX(createdAt) FROM versions GROUP BY model_id").fetchall()
+    return {model_id: pd.Timestamp(created_at) for model_id, created_at in rows}
+
+
+def newer_than(versions, cursor):
+    """Keep the versions created after the cursor (all of them when there is no cursor)."""
+    if cursor is None:
+        return list(versions)
+    return [v for v in versions if pd.Timestamp(v["createdAt"]) > cursor]
+
+
+def fetch_new_versions(model, cursor):
+    """Return the versions of a model newer than its cursor, paging further only when needed."""
+    page = model["versions"]
+    new_versions = []
+    pages = None
+    while True:
+        page_new = newer_than(page["items"], cursor)
+        new_versions.extend(page_new)
+        # Versions come newest first: once a page is not entirely new it reaches the stored history
+        if len(page_new) < len(page["items"]) or len(new_versions) >= page["totalCount"]:
+            return new_versions
+        if pages is None:
+            if not page.get("cursor"):
+                return new_versions
+            pages = iter_model_versions(model["id"], page["cursor"])
+        page = next(pages, None)
+        if page is None:
+            return new_versions
+
+
+def sync_versions():
+    """Download versions newer than the stored cursors and add them to the store.
+
+    Returns:
+        int: Number of new versions stored.
+    """
+    connection = connect()
+    try:
+        cursors = load_cursors(connection)
+        # Once the store has history, only the newest version of each model is requested:
+        # a model whose newest version is not past its cursor needs no further request
+        models = list(iter_models_with_versions(limit=1 if cursors else versions_limit))
+        # Older version pages of long histories are fetched concurrently, per model
+        new_versions = run_concurrently([(fetch_new_versions, (model, cursors.get(model["id"]))) for model in models])
+        rows = []
+        for model, versions in zip(models, new_versions):
+            rows.extend(version_rows(model, versions))
+            # Keep model names current for versions stored under a previous name
+            connection.execute("UPDATE versions SET model_name = ? WHERE model_id = ?", (model["name"], model["id"]))
+        connection.executemany(
+            f"INSERT OR REPLACE INTO versions ({', '.join(VERSION_COLUMNS)}) VALUES ({', '.join('?' * len(VERSION_COLUMNS))})",
+            [tuple(row[c] for c in VERSION_COLUMNS) for row in rows],
+        )
+        connection.commit()
+        return len(rows)
+    finally:
+        connection.close()
+
+
+def read_version_table():
+    """Read every stored version as a version table."""
+    connection = connect()
+    try:
+        rows = connection.execute(f"SELECT {', '.join(VERSION_COLUMNS)} FROM versions").fetchall()
+    finally:
+        connection.close()
+    return to_version_table([dict(zip(VERSION_COLUMNS, row)) for row in rows])
+
+
+def _synced_table():
+    with _sync_lock:
+        sync_versions()
+        return read_version_table()
+
+
+def get_version_table(refresh=False):
+    """Return the shared version table, syncing the store on first use or when refresh is set."""
+    global _version_table
+    if refresh and not is_offline():
+        # Readers keep the current table while the store syncs
+        _version_table = _synced_table()
+        return _version_table
+    with _lock:
+        if _version_table is None:
+            _version_table = to_version_table(load_bundle()["versions"]) if is_offline() else _synced_table()
+        return _version_table
+
+
+def versions_for_model(model_name):
+    """Return the rows of the version table for one model, newest first."""
+    table = get_version_table()
+    return table[table["model_name"] == model_name]